@@ -0,0 +1,27 @@
+"""Add progress completed_at/user_id index for weekly report
+
+Revision ID: 5b2c7e9a1f40
+Revises: d146e5ef0e6b
+Create Date: 2026-10-16 09:12:04.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2c7e9a1f40'
+down_revision: Union[str, Sequence[str], None] = 'd146e5ef0e6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_progress_completed_user', 'progress', ['completed_at', 'user_id', 'points_earned'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_progress_completed_user', table_name='progress')
@@ -0,0 +1,29 @@
+"""Add user/time indexes on attempts and hints
+
+Revision ID: 9e41d3c6b2a8
+Revises: 5b2c7e9a1f40
+Create Date: 2026-10-16 17:21:37.904112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e41d3c6b2a8'
+down_revision: Union[str, Sequence[str], None] = '5b2c7e9a1f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_attempts_user_attempted_at', 'attempts', ['user_id', 'attempted_at'], unique=False)
+    op.create_index('ix_hints_user_accessed_at', 'hints', ['user_id', 'accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hints_user_accessed_at', table_name='hints')
+    op.drop_index('ix_attempts_user_attempted_at', table_name='attempts')
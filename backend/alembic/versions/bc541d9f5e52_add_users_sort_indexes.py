@@ -0,0 +1,33 @@
+"""Add indexes for sorting and filtering the users list
+
+Revision ID: bc541d9f5e52
+Revises: 9e41d3c6b2a8
+Create Date: 2026-10-16 17:20:18.582115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bc541d9f5e52'
+down_revision: Union[str, Sequence[str], None] = '9e41d3c6b2a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_users_created_at'), 'users', ['created_at'], unique=False)
+    op.create_index(op.f('ix_users_name'), 'users', ['name'], unique=False)
+    op.create_index('ix_users_role_created_at', 'users', ['role', 'created_at'], unique=False)
+    op.create_index('ix_users_role_name', 'users', ['role', 'name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_role_name', table_name='users')
+    op.drop_index('ix_users_role_created_at', table_name='users')
+    op.drop_index(op.f('ix_users_name'), table_name='users')
+    op.drop_index(op.f('ix_users_created_at'), table_name='users')
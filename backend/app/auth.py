@@ -20,7 +20,10 @@ from app.models import User
 load_dotenv()
 
 # Create password context with bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
 
 # JWT Configuration from environment variables
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
@@ -125,6 +128,11 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # A JWT is always three dot-separated segments; reject anything else
+    # before doing any decoding or signature work
+    if token.count(".") != 2:
+        raise credentials_exception
+
     try:
         # Decode JWT token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -3,6 +3,7 @@ Hardcoded challenge definitions for MVP.
 In production, these would come from a database.
 """
 
+from functools import lru_cache
 from typing import Optional, Dict, Tuple, Any
 import re
 
@@ -57,6 +58,9 @@ CHALLENGES: Dict[Tuple[int, int], Dict[str, Any]] = {
     },
 }
 
+# Number of built-in challenges, used for completion percentages
+TOTAL_CHALLENGES = len(CHALLENGES)
+
 
 def get_challenge(unit_id: int, challenge_id: int) -> Optional[Dict[str, Any]]:
     """
@@ -86,6 +90,12 @@ def challenge_exists(unit_id: int, challenge_id: int) -> bool:
     return (unit_id, challenge_id) in CHALLENGES
 
 
+# Patterns used by normalize_query, compiled once at import
+_LINE_COMMENT_RE = re.compile(r"--.*?$", re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def normalize_query(query: str) -> str:
     """
     Normalize SQL query for comparison.
@@ -106,20 +116,31 @@ def normalize_query(query: str) -> str:
     query = query.lower()
 
     # Remove single-line comments (-- ...)
-    query = re.sub(r"--.*?$", "", query, flags=re.MULTILINE)
+    query = _LINE_COMMENT_RE.sub("", query)
 
     # Remove multi-line comments (/* ... */)
-    query = re.sub(r"/\*.*?\*/", "", query, flags=re.DOTALL)
+    query = _BLOCK_COMMENT_RE.sub("", query)
 
     # Strip leading/trailing whitespace
     query = query.strip()
 
     # Collapse multiple spaces/newlines to single space
-    query = re.sub(r"\s+", " ", query)
+    query = _WHITESPACE_RE.sub(" ", query)
 
     return query
 
 
+@lru_cache(maxsize=128)
+def _normalized_solution(expected_query: str) -> str:
+    """
+    Normalize an expected solution, remembering the result.
+
+    Only expected solutions repeat across submissions; student queries are
+    almost always unique, so they are normalized without caching.
+    """
+    return normalize_query(expected_query)
+
+
 def validate_query(student_query: str, expected_query: str) -> bool:
     """
     Validate student query against expected query.
@@ -134,5 +155,5 @@ def validate_query(student_query: str, expected_query: str) -> bool:
         True if queries match (after normalization), False otherwise
     """
     normalized_student = normalize_query(student_query)
-    normalized_expected = normalize_query(expected_query)
+    normalized_expected = _normalized_solution(expected_query)
     return normalized_student == normalized_expected
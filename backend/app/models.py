@@ -2,7 +2,7 @@
 Database models for SQL Query Master.
 """
 
-from sqlmodel import SQLModel, Field, UniqueConstraint, Column, Text
+from sqlmodel import SQLModel, Field, UniqueConstraint, Index, Column, Text
 from typing import Optional
 from datetime import datetime
 
@@ -19,17 +19,23 @@ class User(SQLModel, table=True):
 
     __tablename__ = "users"
 
+    # GET /users orders by name or created_at, optionally within one role
+    __table_args__ = (
+        Index("ix_users_role_name", "role", "name"),
+        Index("ix_users_role_created_at", "role", "created_at"),
+    )
+
     # Primary key
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # User details
     email: str = Field(unique=True, index=True, max_length=255)
-    name: str = Field(max_length=100)
+    name: str = Field(max_length=100, index=True)
     role: str = Field(max_length=20)  # 'student' or 'teacher'
     password_hash: str = Field(max_length=255)
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
     last_login: Optional[datetime] = None
 
 
@@ -109,6 +115,14 @@ class Progress(SQLModel, table=True):
             "custom_challenge_id",
             name="unique_user_challenge",
         ),
+        # Covers the weekly report: range scan on completed_at, then group
+        # by user_id and sum points_earned without reading the table
+        Index(
+            "ix_progress_completed_user",
+            "completed_at",
+            "user_id",
+            "points_earned",
+        ),
     )
 
     # Primary key
@@ -150,6 +164,11 @@ class Hint(SQLModel, table=True):
 
     __tablename__ = "hints"
 
+    # One student's hints in time order (detail view, last-activity export)
+    __table_args__ = (
+        Index("ix_hints_user_accessed_at", "user_id", "accessed_at"),
+    )
+
     # Primary key
     id: Optional[int] = Field(default=None, primary_key=True)
 
@@ -187,6 +206,11 @@ class Attempt(SQLModel, table=True):
 
     __tablename__ = "attempts"
 
+    # One student's attempts in time order (detail view, last-activity export)
+    __table_args__ = (
+        Index("ix_attempts_user_attempted_at", "user_id", "attempted_at"),
+    )
+
     # Primary key
     id: Optional[int] = Field(default=None, primary_key=True)
 
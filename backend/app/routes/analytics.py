@@ -17,7 +17,7 @@ from app.schemas import (
     ClassAnalyticsResponse,
 )
 from app.auth import get_current_user, require_teacher
-from app.challenges import get_challenge
+from app.challenges import TOTAL_CHALLENGES, get_challenge
 
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
@@ -211,7 +211,9 @@ def _calculate_class_metrics(session: Session) -> ClassMetrics:
     total_completions = total_completions_result if total_completions_result else 0
 
     if active_students > 0:
-        avg_completion_rate = (total_completions / active_students / 7) * 100
+        avg_completion_rate = (
+            total_completions / active_students / TOTAL_CHALLENGES
+        ) * 100
     else:
         avg_completion_rate = 0.0
 
@@ -13,6 +13,7 @@ from io import StringIO
 from app.database import get_session
 from app.models import User, Progress, Attempt, Hint
 from app.auth import get_current_user, require_teacher
+from app.challenges import TOTAL_CHALLENGES
 
 
 router = APIRouter(prefix="/export", tags=["Export"])
@@ -146,7 +147,7 @@ def _get_student_data(
 
 def _calculate_completion_percentage(completed: int) -> float:
     """
-    Calculate completion percentage based on 7 total challenges.
+    Calculate completion percentage based on TOTAL_CHALLENGES.
 
     Args:
         completed: Number of challenges completed
@@ -157,7 +158,7 @@ def _calculate_completion_percentage(completed: int) -> float:
     if completed == 0:
         return 0.0
 
-    percentage = (completed / 7) * 100
+    percentage = (completed / TOTAL_CHALLENGES) * 100
     return round(percentage, 2)
 
 
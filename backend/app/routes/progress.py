@@ -4,6 +4,7 @@ Progress routes - challenge submission and progress tracking.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 
 from app.database import get_session
@@ -16,7 +17,7 @@ from app.schemas import (
     ProgressSummaryResponse,
 )
 from app.auth import get_current_user, require_student, require_teacher
-from app.challenges import get_challenge, validate_query
+from app.challenges import TOTAL_CHALLENGES, get_challenge, validate_query
 from app.routes.leaderboard import invalidate_cache
 from app.routes.reports import invalidate_weekly_cache
 from app.routes.analytics import invalidate_analytics_cache
@@ -64,7 +65,7 @@ def _calculate_summary_stats(progress_items: list[Progress]) -> ProgressSummaryS
     Calculate aggregate statistics from progress list.
 
     Computes total points earned, count of completed challenges, and
-    completion percentage based on 7 total challenges in the system.
+    completion percentage based on TOTAL_CHALLENGES in the system.
 
     Args:
         progress_items: List of Progress model instances
@@ -74,8 +75,7 @@ def _calculate_summary_stats(progress_items: list[Progress]) -> ProgressSummaryS
     """
     total_points = sum(p.points_earned for p in progress_items)
     total_completed = len(progress_items)
-    # Calculate percentage based on 7 total challenges in system
-    completion_percentage = (total_completed / 7) * 100
+    completion_percentage = (total_completed / TOTAL_CHALLENGES) * 100
     return ProgressSummaryStats(
         total_points=total_points,
         total_completed=total_completed,
@@ -109,6 +109,43 @@ def _get_progress_summary(user_id: int, session: Session) -> ProgressSummaryResp
     return ProgressSummaryResponse(progress_items=progress_items, summary=summary)
 
 
+def _record_attempt(
+    session: Session,
+    user_id: int,
+    submission: ChallengeSubmitRequest,
+    is_correct: bool,
+) -> None:
+    """
+    Record one submission in the Attempt table.
+
+    The row is never read back, so it is written with a Core INSERT rather
+    than through the unit of work. It is built as a model first so that
+    model defaults such as attempted_at still apply. Not committed here.
+
+    Args:
+        session: Database session
+        user_id: ID of the submitting student
+        submission: The challenge submission (custom or hardcoded)
+        is_correct: Whether the submitted query was correct
+    """
+    if submission.custom_challenge_id is not None:
+        attempt = Attempt(
+            user_id=user_id,
+            custom_challenge_id=submission.custom_challenge_id,
+            query=submission.query,
+            is_correct=is_correct,
+        )
+    else:
+        attempt = Attempt(
+            user_id=user_id,
+            unit_id=submission.unit_id,
+            challenge_id=submission.challenge_id,
+            query=submission.query,
+            is_correct=is_correct,
+        )
+    session.execute(insert(Attempt).values(attempt.model_dump(exclude={"id"})))
+
+
 @router.post("/submit", response_model=ProgressResponse, status_code=status.HTTP_200_OK)
 async def submit_challenge(
     submission: ChallengeSubmitRequest,
@@ -183,17 +220,11 @@ async def submit_challenge(
         )
 
         # Create Attempt record
-        attempt = Attempt(
-            user_id=current_user.id,
-            custom_challenge_id=submission.custom_challenge_id,
-            query=submission.query,
-            is_correct=is_correct,
-        )
-        session.add(attempt)
-        session.commit()
+        _record_attempt(session, current_user.id, submission, is_correct)
 
         # If incorrect, return error
         if not is_correct:
+            session.commit()
             logger.warning(
                 f"Incorrect challenge submission: custom_challenge_id={submission.custom_challenge_id}",
                 extra={
@@ -215,6 +246,7 @@ async def submit_challenge(
         existing_progress = session.exec(statement).first()
 
         if existing_progress:
+            session.commit()
             return existing_progress
 
         # Create new progress record
@@ -226,34 +258,37 @@ async def submit_challenge(
             query=submission.query,
         )
 
+        # The savepoint keeps this submission's attempt if another request
+        # created the Progress row first
         try:
-            session.add(progress)
-            session.commit()
-            session.refresh(progress)
-            invalidate_cache()
-            invalidate_weekly_cache()
-            invalidate_analytics_cache()
-
-            logger.info(
-                f"Challenge completed: custom_challenge_id={submission.custom_challenge_id}, points={custom_challenge.points}",
-                extra={
-                    "user_id": current_user.id,
-                    "custom_challenge_id": submission.custom_challenge_id,
-                    "points_earned": custom_challenge.points,
-                    "hints_used": submission.hints_used,
-                },
-            )
-
-            return progress
-
+            with session.begin_nested():
+                session.add(progress)
         except IntegrityError:
-            session.rollback()
             existing_progress = session.exec(statement).first()
+            session.commit()
             invalidate_cache()
             invalidate_weekly_cache()
             invalidate_analytics_cache()
             return existing_progress
 
+        session.commit()
+        session.refresh(progress)
+        invalidate_cache()
+        invalidate_weekly_cache()
+        invalidate_analytics_cache()
+
+        logger.info(
+            f"Challenge completed: custom_challenge_id={submission.custom_challenge_id}, points={custom_challenge.points}",
+            extra={
+                "user_id": current_user.id,
+                "custom_challenge_id": submission.custom_challenge_id,
+                "points_earned": custom_challenge.points,
+                "hints_used": submission.hints_used,
+            },
+        )
+
+        return progress
+
     # Handle hardcoded challenge submission (original logic)
     else:
         # 1. Validate challenge exists
@@ -268,18 +303,12 @@ async def submit_challenge(
         is_correct = validate_query(submission.query, challenge["sample_solution"])
 
         # 3. Create Attempt record (for EVERY submission - correct or incorrect)
-        attempt = Attempt(
-            user_id=current_user.id,
-            unit_id=submission.unit_id,
-            challenge_id=submission.challenge_id,
-            query=submission.query,
-            is_correct=is_correct,
-        )
-        session.add(attempt)
-        session.commit()
+        # It is committed together with the Progress row, if there is one
+        _record_attempt(session, current_user.id, submission, is_correct)
 
         # 4. If incorrect, return error
         if not is_correct:
+            session.commit()
             logger.warning(
                 f"Incorrect challenge submission: unit={submission.unit_id}, challenge={submission.challenge_id}",
                 extra={
@@ -304,6 +333,7 @@ async def submit_challenge(
 
         if existing_progress:
             # Already completed - return existing record (idempotent)
+            session.commit()
             return existing_progress
 
         # 6. Create new progress record (only for first correct submission)
@@ -317,38 +347,40 @@ async def submit_challenge(
         )
 
         try:
-            session.add(progress)
-            session.commit()
-            session.refresh(progress)
-            # Invalidate leaderboard and weekly report caches after new submission
-            invalidate_cache()
-            invalidate_weekly_cache()
-            invalidate_analytics_cache()
-
-            logger.info(
-                f"Challenge completed: unit={submission.unit_id}, challenge={submission.challenge_id}, points={challenge['points']}",
-                extra={
-                    "user_id": current_user.id,
-                    "unit_id": submission.unit_id,
-                    "challenge_id": submission.challenge_id,
-                    "points_earned": challenge["points"],
-                    "hints_used": submission.hints_used,
-                },
-            )
-
-            return progress
-
+            # Savepoint: on a race only the Progress insert is rolled back,
+            # the attempt above is kept
+            with session.begin_nested():
+                session.add(progress)
         except IntegrityError:
-            # Race condition: another request created it
-            # Rollback and return existing
-            session.rollback()
+            # Race condition: another request created it - return existing
             existing_progress = session.exec(statement).first()
+            session.commit()
             # Invalidate caches in case this completes a first-time submission
             invalidate_cache()
             invalidate_weekly_cache()
             invalidate_analytics_cache()
             return existing_progress
 
+        session.commit()
+        session.refresh(progress)
+        # Invalidate leaderboard and weekly report caches after new submission
+        invalidate_cache()
+        invalidate_weekly_cache()
+        invalidate_analytics_cache()
+
+        logger.info(
+            f"Challenge completed: unit={submission.unit_id}, challenge={submission.challenge_id}, points={challenge['points']}",
+            extra={
+                "user_id": current_user.id,
+                "unit_id": submission.unit_id,
+                "challenge_id": submission.challenge_id,
+                "points_earned": challenge["points"],
+                "hints_used": submission.hints_used,
+            },
+        )
+
+        return progress
+
 
 @router.get("/me", response_model=ProgressSummaryResponse)
 async def get_my_progress(
@@ -4,7 +4,7 @@ Reports routes - weekly progress summaries for teachers.
 
 import time
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy import func
 from sqlmodel import Session, select
 
@@ -19,7 +19,7 @@ from app.auth import get_current_user, require_teacher
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
-# In-memory cache with TTL
+# In-memory cache with TTL; holds the serialized JSON body of the report
 _weekly_cache = {"data": None, "timestamp": None}
 CACHE_TTL = 60 * 60  # 1 hour in seconds
 
@@ -170,7 +170,7 @@ async def get_weekly_report(
     - Top 5 performers by points
     - Struggling students (<3 completions)
 
-    The report is cached for 1 hour to improve performance.
+    The report is cached for 1 hour as serialized JSON to improve performance.
     Cache is invalidated when new progress submissions are made.
 
     Args:
@@ -186,14 +186,13 @@ async def get_weekly_report(
         HTTPException: 403 if not a teacher
     """
     # Check if cache is valid
-    if _is_cache_valid():
-        return _weekly_cache["data"]
+    if not _is_cache_valid():
+        # Query database, build report and serialize it once
+        report = _build_weekly_report(session)
 
-    # Query database and build report
-    data = _build_weekly_report(session)
+        # Store in cache with timestamp
+        _weekly_cache["data"] = report.model_dump_json().encode()
+        _weekly_cache["timestamp"] = time.time()
 
-    # Store in cache with timestamp
-    _weekly_cache["data"] = data
-    _weekly_cache["timestamp"] = time.time()
-
-    return data
+    # Cached bytes are returned as-is, skipping response model serialization
+    return Response(content=_weekly_cache["data"], media_type="application/json")
@@ -2,9 +2,13 @@
 User routes - protected endpoints requiring authentication.
 """
 
+import base64
+import binascii
+import heapq
+from collections import defaultdict
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, tuple_
 from sqlmodel import Session, select
 from app.database import get_session
 from app.models import User, Progress, Attempt, Hint
@@ -35,32 +39,35 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 
 def _get_student_attempts(user_id: int, session: Session) -> list[Attempt]:
-    """Get all attempts for a student."""
-    statement = select(Attempt).where(Attempt.user_id == user_id)
+    """Get all attempts for a student, oldest first."""
+    statement = (
+        select(Attempt)
+        .where(Attempt.user_id == user_id)
+        .order_by(Attempt.attempted_at, Attempt.id)
+    )
     return session.exec(statement).all()
 
 
 def _get_student_hints(user_id: int, session: Session) -> list[Hint]:
-    """Get all hint accesses for a student."""
-    statement = select(Hint).where(Hint.user_id == user_id)
+    """Get all hint accesses for a student, oldest first."""
+    statement = (
+        select(Hint).where(Hint.user_id == user_id).order_by(Hint.accessed_at, Hint.id)
+    )
     return session.exec(statement).all()
 
 
 def _get_student_progress(user_id: int, session: Session) -> list[Progress]:
-    """Get all completed challenges for a student."""
-    statement = select(Progress).where(Progress.user_id == user_id)
+    """Get all completed challenges for a student, ordered by challenge."""
+    statement = (
+        select(Progress)
+        .where(Progress.user_id == user_id)
+        .order_by(Progress.unit_id, Progress.challenge_id)
+    )
     return session.exec(statement).all()
 
 
-def _calculate_challenge_metrics(
-    unit_id: int, challenge_id: int, attempts: list[Attempt]
-) -> ChallengeMetrics:
-    """Calculate metrics for a specific challenge."""
-    # Filter attempts for this challenge
-    challenge_attempts = [
-        a for a in attempts if a.unit_id == unit_id and a.challenge_id == challenge_id
-    ]
-
+def _calculate_challenge_metrics(challenge_attempts: list[Attempt]) -> ChallengeMetrics:
+    """Calculate metrics from one challenge's attempts."""
     total = len(challenge_attempts)
     correct = sum(1 for a in challenge_attempts if a.is_correct)
     success_rate = (correct / total * 100) if total > 0 else 0.0
@@ -83,50 +90,40 @@ def _build_activity_log(
     attempts: list[Attempt], hints: list[Hint], limit: int = 10
 ) -> list[ActivityLogEntry]:
     """Build activity log from attempts and hints (newest first, limited to N items)."""
-    activities = []
+    # Pick the newest N events before building any entries
+    events = [(attempt.attempted_at, attempt) for attempt in attempts]
+    events += [(hint.accessed_at, hint) for hint in hints]
+    newest = heapq.nlargest(limit, events, key=lambda event: event[0])
 
-    # Add attempts
-    for attempt in attempts:
-        challenge = get_challenge(attempt.unit_id, attempt.challenge_id)
-        action = "Submitted" if attempt.is_correct else "Attempted"
-        details = (
-            f"{action} challenge (correct)"
-            if attempt.is_correct
-            else f"{action} challenge"
-        )
-
-        activities.append(
-            ActivityLogEntry(
-                action_type="attempt",
-                unit_id=attempt.unit_id,
-                challenge_id=attempt.challenge_id,
-                challenge_title=challenge.get("title", "Unknown")
-                if challenge
-                else "Unknown",
-                timestamp=attempt.attempted_at,
-                details=details,
+    activities = []
+    for timestamp, event in newest:
+        challenge = get_challenge(event.unit_id, event.challenge_id)
+        challenge_title = challenge.get("title", "Unknown") if challenge else "Unknown"
+
+        if isinstance(event, Attempt):
+            action = "Submitted" if event.is_correct else "Attempted"
+            details = (
+                f"{action} challenge (correct)"
+                if event.is_correct
+                else f"{action} challenge"
             )
-        )
+            action_type = "attempt"
+        else:
+            details = f"Accessed level {event.hint_level} hint"
+            action_type = "hint"
 
-    # Add hints
-    for hint in hints:
-        challenge = get_challenge(hint.unit_id, hint.challenge_id)
         activities.append(
             ActivityLogEntry(
-                action_type="hint",
-                unit_id=hint.unit_id,
-                challenge_id=hint.challenge_id,
-                challenge_title=challenge.get("title", "Unknown")
-                if challenge
-                else "Unknown",
-                timestamp=hint.accessed_at,
-                details=f"Accessed level {hint.hint_level} hint",
+                action_type=action_type,
+                unit_id=event.unit_id,
+                challenge_id=event.challenge_id,
+                challenge_title=challenge_title,
+                timestamp=timestamp,
+                details=details,
             )
         )
 
-    # Sort by timestamp descending (newest first) and limit
-    activities.sort(key=lambda x: x.timestamp, reverse=True)
-    return activities[:limit]
+    return activities
 
 
 def _build_detailed_response(
@@ -140,6 +137,15 @@ def _build_detailed_response(
     # Build challenge details by unit
     units_dict = {}  # unit_id -> list of ChallengeDetail
 
+    # Bucket attempts and hints by challenge in one pass each
+    attempts_by_challenge = defaultdict(list)
+    for a in attempts:
+        attempts_by_challenge[(a.unit_id, a.challenge_id)].append(a)
+
+    hints_by_challenge = defaultdict(list)
+    for h in hints:
+        hints_by_challenge[(h.unit_id, h.challenge_id)].append(h)
+
     # Add all completed challenges
     for p in progress:
         if p.unit_id not in units_dict:
@@ -150,11 +156,7 @@ def _build_detailed_response(
             continue
 
         # Get attempts for this challenge
-        challenge_attempts = [
-            a
-            for a in attempts
-            if a.unit_id == p.unit_id and a.challenge_id == p.challenge_id
-        ]
+        challenge_attempts = attempts_by_challenge[(p.unit_id, p.challenge_id)]
 
         # Convert to AttemptRecords
         attempt_records = [
@@ -165,15 +167,11 @@ def _build_detailed_response(
                 is_correct=a.is_correct,
                 attempted_at=a.attempted_at,
             )
-            for a in sorted(challenge_attempts, key=lambda x: x.attempted_at)
+            for a in challenge_attempts
         ]
 
         # Get hints for this challenge
-        challenge_hints = [
-            h
-            for h in hints
-            if h.unit_id == p.unit_id and h.challenge_id == p.challenge_id
-        ]
+        challenge_hints = hints_by_challenge[(p.unit_id, p.challenge_id)]
 
         hint_records = [
             HintAccessRecord(
@@ -182,11 +180,11 @@ def _build_detailed_response(
                 hint_level=h.hint_level,
                 accessed_at=h.accessed_at,
             )
-            for h in sorted(challenge_hints, key=lambda x: x.accessed_at)
+            for h in challenge_hints
         ]
 
         # Calculate metrics
-        metrics = _calculate_challenge_metrics(p.unit_id, p.challenge_id, attempts)
+        metrics = _calculate_challenge_metrics(challenge_attempts)
         metrics.total_hints_used = len(hint_records)
 
         # Build challenge detail
@@ -212,9 +210,8 @@ def _build_detailed_response(
     }
 
     for unit_id in [1, 2, 3]:
+        # Already in challenge_id order from the progress query
         challenges = units_dict.get(unit_id, [])
-        # Sort challenges by challenge_id
-        challenges.sort(key=lambda c: c.challenge_id)
 
         unit_detail = UnitDetail(
             unit_id=unit_id,
@@ -263,17 +260,41 @@ def _build_detailed_response(
     )
 
 
+def _encode_users_cursor(created_at: datetime, user_id: int) -> str:
+    """Encode the position after a user in the sort=date order."""
+    raw = f"{created_at.isoformat()}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_users_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor from _encode_users_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, user_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
 @router.get("/", response_model=StudentListResponse)
 async def list_all_users(
     current_user: User = Depends(get_current_user),
     _: None = Depends(require_teacher),
     session: Session = Depends(get_session),
-    role: str | None = None,
+    role: str | None = Query(default=None, pattern="^(student|teacher)$"),
     sort: str = Query(
         default="name", pattern="^(name|points|date)$"
     ),  # Validate sort parameter
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=1000),
+    cursor: str | None = None,
 ):
     """
     List all users with filtering, sorting, and pagination (teachers only).
@@ -286,52 +307,87 @@ async def list_all_users(
         sort: Sort by field (name|points|date). Default: name
         offset: Pagination offset. Default: 0
         limit: Pagination limit (1-1000). Default: 10
+        cursor: next_cursor from the previous page (sort=date only). The page
+            starts right after that user, so it cannot be combined with a
+            non-zero offset. Optional.
 
     Returns:
         StudentListResponse with paginated students and their aggregated stats
 
     Raises:
+        HTTPException: 400 if cursor is malformed, used without sort=date or
+            combined with a non-zero offset
         HTTPException: 401 if not authenticated
         HTTPException: 403 if user is not a teacher
-        HTTPException: 422 if validation fails (invalid sort or limit > 1000)
+        HTTPException: 422 if validation fails (invalid role, sort or limit > 1000)
     """
-    # Build aggregation subquery to get stats per user
-    stats_subquery = (
-        select(
-            Progress.user_id,
-            func.sum(Progress.points_earned).label("total_points"),
-            func.count(Progress.id).label("challenges_completed"),
+    if cursor is not None and sort != "date":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor is only supported with sort=date",
+        )
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor cannot be combined with offset",
         )
-        .group_by(Progress.user_id)
-        .subquery()
-    )
 
-    # Build main query with LEFT JOIN to stats subquery
-    statement = select(
-        User.id,
-        User.email,
-        User.name,
-        User.role,
-        User.created_at,
-        stats_subquery.c.total_points,
-        stats_subquery.c.challenges_completed,
-    ).outerjoin(stats_subquery, User.id == stats_subquery.c.user_id)
-
-    # Filter by role if provided
-    if role:
-        statement = statement.where(User.role == role)
+    user_columns = (User.id, User.email, User.name, User.role, User.created_at)
 
-    # Sort based on parameter
-    if sort == "name":
-        statement = statement.order_by(User.name)
-    elif sort == "points":
+    if sort == "points":
+        # The sort key is the aggregate itself, so every user's stats are
+        # needed before the page can be picked
+        stats_subquery = (
+            select(
+                Progress.user_id,
+                func.sum(Progress.points_earned).label("total_points"),
+                func.count(Progress.id).label("challenges_completed"),
+            )
+            .group_by(Progress.user_id)
+            .subquery()
+        )
+        statement = select(
+            *user_columns,
+            stats_subquery.c.total_points,
+            stats_subquery.c.challenges_completed,
+        ).outerjoin(stats_subquery, User.id == stats_subquery.c.user_id)
+        if role:
+            statement = statement.where(User.role == role)
         # Sort by total_points descending, then by name for tie-breaking
-        statement = statement.order_by(
-            stats_subquery.c.total_points.desc().nullslast(), User.name
+        statement = (
+            statement.order_by(
+                stats_subquery.c.total_points.desc().nullslast(), User.name
+            )
+            .offset(offset)
+            .limit(limit)
+        )
+    else:
+        # Pick the page of users first, then aggregate progress for just
+        # those users rather than for the whole table
+        if sort == "name":
+            sort_columns = (User.name,)
+        else:
+            # id breaks ties so a cursor always points at one position
+            sort_columns = (User.created_at, User.id)
+        page_query = select(*user_columns)
+        if role:
+            page_query = page_query.where(User.role == role)
+        if cursor is not None:
+            after_created_at, after_id = _decode_users_cursor(cursor)
+            page_query = page_query.where(
+                tuple_(User.created_at, User.id) > tuple_(after_created_at, after_id)
+            )
+        page = page_query.order_by(*sort_columns).offset(offset).limit(limit).subquery()
+        statement = (
+            select(
+                *page.c,
+                func.sum(Progress.points_earned).label("total_points"),
+                func.count(Progress.id).label("challenges_completed"),
+            )
+            .outerjoin(Progress, Progress.user_id == page.c.id)
+            .group_by(*page.c)
+            .order_by(*(page.c[column.key] for column in sort_columns))
         )
-    elif sort == "date":
-        # Sort by created_at ascending
-        statement = statement.order_by(User.created_at)
 
     # Get total count BEFORE pagination
     count_query = select(func.count(User.id)).select_from(User)
@@ -340,9 +396,6 @@ async def list_all_users(
 
     total_count = session.exec(count_query).one()
 
-    # Apply pagination
-    statement = statement.offset(offset).limit(limit)
-
     # Execute main query
     results = session.exec(statement).all()
 
@@ -361,11 +414,17 @@ async def list_all_users(
             )
         )
 
+    # A short page means there is nothing after it
+    next_cursor = None
+    if sort == "date" and len(students) == limit:
+        next_cursor = _encode_users_cursor(students[-1].created_at, students[-1].id)
+
     return StudentListResponse(
         students=students,
         total_count=total_count,
         offset=offset,
         limit=limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -429,15 +488,18 @@ async def read_user_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    # Return detailed view if requested
+    # Return detailed view if requested, otherwise the basic user response
     if detailed:
         progress = _get_student_progress(user_id, session)
         attempts = _get_student_attempts(user_id, session)
         hints = _get_student_hints(user_id, session)
-        return _build_detailed_response(user, progress, attempts, hints, session)
+        body = _build_detailed_response(user, progress, attempts, hints, session)
+    else:
+        body = UserResponse.model_validate(user)
 
-    # Return basic user response
-    return user
+    # Already a validated schema; serialize it directly instead of going
+    # through jsonable_encoder (the route has no response_model)
+    return Response(content=body.model_dump_json(), media_type="application/json")
 
 
 @router.put("/me", response_model=UserResponse)
@@ -305,6 +305,7 @@ class StudentListResponse(BaseModel):
     total_count: int  # Total number of students matching the filter
     offset: int  # Pagination offset
     limit: int  # Pagination limit
+    next_cursor: str | None = None  # Pass as ?cursor= for the next sort=date page
 
 
 class AttemptRecord(BaseModel):
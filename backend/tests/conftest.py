@@ -0,0 +1,258 @@
+"""
+Shared pytest fixtures.
+
+By default tests run against an in-memory SQLite database. Setting
+``TEST_DATABASE=postgres`` (as CI does) runs them against a throwaway
+Postgres container instead, so dialect-specific behaviour is exercised
+against the same engine as production.
+
+The schema is created once per session; each test runs inside a transaction
+that is rolled back afterwards.
+
+Under pytest-xdist every worker is its own process, so each one gets a
+private in-memory database (or its own container).
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+from sqlmodel import Session, SQLModel, create_engine, text
+
+# Minimum bcrypt cost for any hash the suite does compute; read by app.auth
+# at import time, so it has to be set first
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+# Importing app.models registers every table with SQLModel.metadata
+from app.auth import (  # noqa: E402
+    create_access_token,
+    create_refresh_token,
+    hash_password,
+    pwd_context,
+)
+from app.models import User  # noqa: E402
+from app.database import get_session  # noqa: E402
+
+TEST_DATABASE = os.getenv("TEST_DATABASE", "sqlite").lower()
+POSTGRES_IMAGE = os.getenv("TEST_POSTGRES_IMAGE", "postgres:16-alpine")
+
+
+@compiles(CreateTable, "postgresql")
+def _create_unlogged_table(element, compiler, **kw):
+    """
+    Emit CREATE UNLOGGED TABLE for the test database.
+
+    Unlogged tables skip the WAL entirely, which is safe for a container
+    that is thrown away at the end of the session.
+    """
+    ddl = compiler.visit_create_table(element, **kw)
+    return ddl.replace("CREATE TABLE", "CREATE UNLOGGED TABLE", 1)
+
+
+@pytest.fixture(scope="session")
+def postgres_engine():
+    """
+    Start a Postgres container once per session and create the schema.
+
+    Durability settings are switched off since the data never outlives the run.
+    """
+    from testcontainers.postgres import PostgresContainer
+
+    container = PostgresContainer(POSTGRES_IMAGE, driver="psycopg2")
+    container.with_command(
+        "postgres -c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+    )
+    with container:
+        engine = create_engine(container.get_connection_url())
+        SQLModel.metadata.create_all(engine, checkfirst=False)
+        yield engine
+        engine.dispose()
+
+
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture(request):
+    """
+    Create the test database engine and schema once per session.
+
+    The database always starts empty, so ``create_all`` skips its
+    table-existence checks.
+
+    SQLite uses StaticPool so all connections share the same in-memory
+    database. pysqlite's own transaction handling is switched off so that
+    SAVEPOINTs work and each test can be rolled back (see ``connection``).
+    """
+    if TEST_DATABASE == "postgres":
+        yield request.getfixturevalue("postgres_engine")
+        return
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    SQLModel.metadata.create_all(engine, checkfirst=False)
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture(name="connection")
+def connection_fixture(engine):
+    """
+    Open a connection whose outer transaction is rolled back after the test.
+
+    Sessions bound to it commit into SAVEPOINTs, so nothing a test writes
+    outlives it and the schema never has to be recreated.
+    """
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+
+    if engine.dialect.name == "postgresql":
+        # Sequences are not transactional; restart them so ids begin at 1 again
+        with engine.begin() as conn:
+            for table in SQLModel.metadata.sorted_tables:
+                conn.execute(
+                    text(
+                        "SELECT setval(pg_get_serial_sequence(:table, 'id'), 1, false)"
+                    ),
+                    {"table": table.name},
+                )
+
+
+@pytest.fixture(name="session")
+def session_fixture(connection):
+    """
+    Create a database session for direct database access in tests.
+    """
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+        yield session
+
+
+@pytest.fixture(name="app", scope="session")
+def app_fixture():
+    """
+    Import the FastAPI app once per session without touching the real database.
+    """
+    # Patch create_db_and_tables FIRST before importing app
+    with patch("app.database.create_db_and_tables"):
+        from app.main import app as fastapi_app
+
+    return fastapi_app
+
+
+@pytest.fixture(name="test_client", scope="session")
+def test_client_fixture(app):
+    """
+    One TestClient (and app lifespan) shared by the whole session.
+
+    Isolation between tests comes from the rolled-back connection that
+    ``client`` installs, not from a fresh client.
+    """
+    with TestClient(app, raise_server_exceptions=True) as test_client:
+        yield test_client
+
+
+@pytest.fixture(name="client")
+def client_fixture(app, test_client, connection):
+    """
+    Point the shared test client at this test's transaction.
+    """
+
+    def get_test_session():
+        with Session(
+            bind=connection, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_test_session
+
+    yield test_client
+
+    test_client.cookies.clear()
+    app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(name="make_user")
+def make_user_fixture(session):
+    """
+    Factory that inserts a user directly and mints their tokens.
+
+    Skips the /auth/register and /auth/login round trips for tests that only
+    need an authenticated user. Tokens carry the same claims as a real login.
+
+    Returns:
+        Callable returning (user, access_token, refresh_token)
+    """
+
+    def make_user(
+        email: str,
+        name: str = "Test User",
+        role: str = "student",
+        password: str = "password123",
+    ) -> tuple[User, str, str]:
+        user = User(
+            email=email,
+            name=name,
+            role=role,
+            password_hash=hash_password(password),
+        )
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        access_token = create_access_token(
+            data={"sub": user.email, "user_id": user.id, "role": user.role}
+        )
+        refresh_token = create_refresh_token(user.id, session)
+        return user, access_token, refresh_token
+
+    return make_user
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cached_password_hashing():
+    """
+    Run bcrypt at most once per distinct password for the whole session.
+
+    Hashes are remembered per plaintext, and verifying against a remembered
+    hash is a dictionary lookup. Any other hash (e.g. one built by hand in a
+    test) still goes through the real ``verify``.
+    """
+    real_hash = pwd_context.hash
+    real_verify = pwd_context.verify
+    hashes: dict[str, str] = {}
+    plaintexts: dict[str, str] = {}
+
+    def cached_hash(secret, **kwargs):
+        if secret not in hashes:
+            hashed = real_hash(secret, **kwargs)
+            hashes[secret] = hashed
+            plaintexts[hashed] = secret
+        return hashes[secret]
+
+    def cached_verify(secret, hashed, **kwargs):
+        if hashed in plaintexts:
+            return plaintexts[hashed] == secret
+        return real_verify(secret, hashed, **kwargs)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(pwd_context, "hash", cached_hash)
+        mp.setattr(pwd_context, "verify", cached_verify)
+        yield
@@ -5,69 +5,11 @@ Tests GET /analytics/class endpoint.
 
 from datetime import datetime
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlalchemy.pool import StaticPool
-import pytest
-from unittest.mock import patch
 
 # Import models at module level so SQLModel knows about them
 from app.models import User, Progress, Attempt, Hint  # noqa: F401
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
-
-
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -3,11 +3,8 @@ Bulk student import tests.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import Session, select, create_engine, SQLModel
-from sqlalchemy.pool import StaticPool
+from sqlmodel import select
 from io import BytesIO
-from unittest.mock import patch
 from app.models import User  # noqa: F401
 
 
@@ -16,55 +13,6 @@ from app.models import User  # noqa: F401
 # ============================================================================
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-        client = TestClient(app)
-        yield client
-        app.dependency_overrides.clear()
-
-
 def create_csv_content(rows: list[dict]) -> bytes:
     """
     Create CSV content from list of dicts.
@@ -8,57 +8,9 @@ Tests full workflows spanning multiple endpoints:
 - Concurrent requests: test concurrent submissions by multiple students
 """
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlalchemy.pool import StaticPool
-from unittest.mock import patch
-
 from app.models import User  # noqa: F401
 
 
-# ============================================================================
-# FIXTURES
-# ============================================================================
-
-
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """Create a test database engine."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    yield engine
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """Create a database session."""
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """Create a test client."""
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-        client = TestClient(app)
-        yield client
-        app.dependency_overrides.clear()
-
-
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -2,74 +2,23 @@
 Test leaderboard endpoint - public gamification feature.
 """
 
-from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlalchemy.pool import StaticPool
 import pytest
-from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlmodel import Session
 
 # Import models at module level so SQLModel knows about them
 from app.models import User, Progress  # noqa: F401
+from app.routes.leaderboard import invalidate_cache
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
+@pytest.fixture(autouse=True)
+def clear_leaderboard_cache():
     """
-    Create a database session for direct database access in tests.
+    Start and finish every test with an empty leaderboard cache.
     """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-        from app.routes.leaderboard import invalidate_cache
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Clear cache before test
-        invalidate_cache()
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
-        # Clear cache after test
-        invalidate_cache()
+    invalidate_cache()
+    yield
+    invalidate_cache()
 
 
 # ============================================================================
@@ -2,26 +2,12 @@
 Test database models.
 """
 
-from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel import Session
 from app.models import User
 from sqlalchemy.exc import IntegrityError
 import pytest
 
 
-@pytest.fixture(name="session")
-def session_fixture():
-    """
-    Create a fresh in-memory database for each test.
-    This ensures tests don't interfere with each other.
-    """
-    # In-memory SQLite database for testing
-    engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(engine)
-
-    with Session(engine) as session:
-        yield session
-
-
 def test_create_user(session: Session):
     """Test creating a user in the database."""
 
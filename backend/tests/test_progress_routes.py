@@ -2,68 +2,46 @@
 Test progress routes - challenge submission endpoint.
 """
 
+from math import isclose
+
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel, select
-from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, select
 import pytest
-from unittest.mock import patch
+
+from app.challenges import TOTAL_CHALLENGES
 
 # Import models at module level so SQLModel knows about them
 from app.models import User, Progress  # noqa: F401
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
+# First three unit 1 challenges with a correct query, in submission order
+UNIT_ONE_SUBMISSIONS = [
+    {"unit_id": 1, "challenge_id": 1, "query": "SELECT * FROM users", "hints_used": 2},
+    {
+        "unit_id": 1,
+        "challenge_id": 2,
+        "query": "SELECT name, email FROM users",
+        "hints_used": 1,
+    },
+    {
+        "unit_id": 1,
+        "challenge_id": 3,
+        "query": "SELECT * FROM users WHERE age > 18",
+        "hints_used": 0,
+    },
+]
+UNIT_ONE_POINTS = [100, 150, 200]
+
+# One correct submission from each unit plus a second unit 1 challenge
+CROSS_UNIT_SUBMISSIONS = [
+    {"unit_id": unit_id, "challenge_id": challenge_id, "query": query, "hints_used": 0}
+    for (unit_id, challenge_id), query in {
+        (1, 1): "SELECT * FROM users",
+        (1, 2): "SELECT name, email FROM users",
+        (2, 1): "SELECT * FROM users INNER JOIN orders ON users.id = orders.user_id",
+        (3, 1): "SELECT COUNT(*) FROM users",
+    }.items()
+]
 
 
 # ============================================================================
@@ -71,58 +49,75 @@ def client_fixture(engine):
 # ============================================================================
 
 
+def _pct(completed: int) -> float:
+    """Expected completion percentage for a number of completed challenges."""
+    return completed * 100 / TOTAL_CHALLENGES
+
+
 def create_student_and_get_token(
-    client: TestClient, email: str, password: str, name: str
-) -> str:
+    make_user, email: str, password: str, name: str
+) -> tuple[int, str]:
     """
-    Helper function to register a student and get their JWT token.
+    Helper function to create a student and get their JWT token.
+
+    The user is inserted directly instead of going through /auth/register
+    and /auth/login.
 
     Args:
-        client: TestClient instance
+        make_user: make_user fixture
         email: Student email
         password: Student password
         name: Student name
 
     Returns:
-        JWT access token string
+        Tuple of (user id, JWT access token string)
     """
-    # Register student
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": "student"},
-    )
-
-    # Login and get token
-    response = client.post("/auth/login", json={"email": email, "password": password})
-
-    return response.json()["access_token"]
+    user, access_token, _ = make_user(email, name, role="student", password=password)
+    return user.id, access_token
 
 
 def create_teacher_and_get_token(
-    client: TestClient, email: str, password: str, name: str
-) -> str:
+    make_user, email: str, password: str, name: str
+) -> tuple[int, str]:
     """
-    Helper function to register a teacher and get their JWT token.
+    Helper function to create a teacher and get their JWT token.
+
+    The user is inserted directly instead of going through /auth/register
+    and /auth/login.
 
     Args:
-        client: TestClient instance
+        make_user: make_user fixture
         email: Teacher email
         password: Teacher password
         name: Teacher name
 
     Returns:
-        JWT access token string
+        Tuple of (user id, JWT access token string)
     """
-    # Register teacher
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": "teacher"},
-    )
+    user, access_token, _ = make_user(email, name, role="teacher", password=password)
+    return user.id, access_token
 
-    # Login and get token
-    response = client.post("/auth/login", json={"email": email, "password": password})
 
-    return response.json()["access_token"]
+def submit_challenges(client: TestClient, token: str, submissions: list[dict]) -> list:
+    """
+    Helper function to submit several challenges as one student.
+
+    Requests are sent one after another: every request shares the test's
+    single database connection, so they cannot safely run concurrently.
+
+    Args:
+        client: TestClient instance
+        token: Student JWT token
+        submissions: /progress/submit request bodies
+
+    Returns:
+        List of responses, in submission order
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    return [
+        client.post("/progress/submit", headers=headers, json=submission)
+        for submission in submissions
+    ]
 
 
 # ============================================================================
@@ -130,11 +125,11 @@ def create_teacher_and_get_token(
 # ============================================================================
 
 
-def test_submit_challenge_success(client: TestClient, session: Session):
+def test_submit_challenge_success(client: TestClient, session: Session, make_user):
     """Test successful challenge submission by student."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit challenge
@@ -170,11 +165,11 @@ def test_submit_challenge_success(client: TestClient, session: Session):
     assert progress.query == "SELECT * FROM users"
 
 
-def test_submit_challenge_with_hints(client: TestClient):
+def test_submit_challenge_with_hints(client: TestClient, make_user):
     """Test submission with hints_used."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit with hints
@@ -197,11 +192,11 @@ def test_submit_challenge_with_hints(client: TestClient):
     assert data["points_earned"] == 150  # Challenge 1-2
 
 
-def test_submit_stores_query(client: TestClient, session: Session):
+def test_submit_stores_query(client: TestClient, session: Session, make_user):
     """Test that SQL query is stored in database."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit with specific query (must match expected for challenge 1-3)
@@ -232,11 +227,13 @@ def test_submit_stores_query(client: TestClient, session: Session):
 # ============================================================================
 
 
-def test_duplicate_submission_returns_existing(client: TestClient, session: Session):
+def test_duplicate_submission_returns_existing(
+    client: TestClient, session: Session, make_user
+):
     """Test that submitting same challenge twice returns existing progress."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # First submission (correct query for challenge 2-1)
@@ -284,11 +281,13 @@ def test_duplicate_submission_returns_existing(client: TestClient, session: Sess
     assert len(results) == 1
 
 
-def test_duplicate_with_different_query_ignored(client: TestClient, session: Session):
+def test_duplicate_with_different_query_ignored(
+    client: TestClient, session: Session, make_user
+):
     """Test that duplicate submission ignores new query/hints."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # First submission (exact match to expected)
@@ -333,11 +332,11 @@ def test_duplicate_with_different_query_ignored(client: TestClient, session: Ses
 # ============================================================================
 
 
-def test_submit_invalid_challenge_404(client: TestClient):
+def test_submit_invalid_challenge_404(client: TestClient, make_user):
     """Test submitting non-existent challenge returns 404."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit invalid challenge
@@ -358,11 +357,11 @@ def test_submit_invalid_challenge_404(client: TestClient):
     assert "challenge not found" in data["detail"].lower()
 
 
-def test_submit_invalid_unit_404(client: TestClient):
+def test_submit_invalid_unit_404(client: TestClient, make_user):
     """Test submitting invalid unit returns 404."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit invalid unit
@@ -380,11 +379,13 @@ def test_submit_invalid_unit_404(client: TestClient):
     assert response.status_code == 404
 
 
-def test_multiple_challenges_same_student(client: TestClient, session: Session):
+def test_multiple_challenges_same_student(
+    client: TestClient, session: Session, make_user
+):
     """Test student can submit multiple different challenges."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit challenge 1
@@ -456,11 +457,11 @@ def test_submit_requires_authentication(client: TestClient):
     assert response.status_code == 401
 
 
-def test_teacher_cannot_submit(client: TestClient):
+def test_teacher_cannot_submit(client: TestClient, make_user):
     """Test that teachers cannot submit challenges (student-only)."""
     # Create teacher and get token
-    token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+    _, token = create_teacher_and_get_token(
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Try to submit
@@ -481,11 +482,13 @@ def test_teacher_cannot_submit(client: TestClient):
     assert "permission" in data["detail"].lower()
 
 
-def test_student_can_only_submit_for_self(client: TestClient, session: Session):
+def test_student_can_only_submit_for_self(
+    client: TestClient, session: Session, make_user
+):
     """Test that user_id is extracted from token (no spoofing)."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    student_id, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit challenge
@@ -503,15 +506,12 @@ def test_student_can_only_submit_for_self(client: TestClient, session: Session):
     assert response.status_code == 200
 
     # Verify progress.user_id matches student from token
-    statement = select(User).where(User.email == "student@test.com")
-    user = session.exec(statement).first()
-
     statement = select(Progress).where(
         Progress.unit_id == 1, Progress.challenge_id == 1
     )
     progress = session.exec(statement).first()
 
-    assert progress.user_id == user.id
+    assert progress.user_id == student_id
 
 
 # ============================================================================
@@ -519,11 +519,11 @@ def test_student_can_only_submit_for_self(client: TestClient, session: Session):
 # ============================================================================
 
 
-def test_submit_response_format(client: TestClient):
+def test_submit_response_format(client: TestClient, make_user):
     """Test that response contains all required fields."""
     # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit challenge (correct query for 2-2)
@@ -564,62 +564,61 @@ def test_submit_response_format(client: TestClient):
 # ============================================================================
 
 
-def test_get_progress_me_student_success(client: TestClient, session: Session):
-    """Test student successfully retrieves their own progress with summary stats."""
-    # Create student and get token
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
+@pytest.fixture(params=[1, 2, 3], ids=lambda n: f"{n}_submitted")
+def student_with_n_submissions(request, client, make_user):
+    """
+    A student who has submitted the first N unit 1 challenges.
 
-    # Submit some challenges
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
-    )
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 2,
-            "query": "SELECT name, email FROM users",
-            "hints_used": 1,
-        },
+    Returns:
+        Tuple of (N, /progress/me response data)
+    """
+    n = request.param
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
+    submit_challenges(client, token, UNIT_ONE_SUBMISSIONS[:n])
 
-    # Get progress
     response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return n, response.json()
+
+
+@pytest.fixture
+def progress_with_one_submission(client, make_user) -> dict:
+    """
+    /progress/me data for a student who has submitted one challenge.
+
+    For tests whose assertions do not depend on how many challenges were
+    submitted, so they skip the N=2 and N=3 setups.
+    """
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
+    )
+    submit_challenges(client, token, UNIT_ONE_SUBMISSIONS[:1])
 
+    response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
     assert response.status_code == 200
-    data = response.json()
+    return response.json()
+
+
+def test_get_progress_me_student_success(student_with_n_submissions):
+    """Test student successfully retrieves their own progress."""
+    n, data = student_with_n_submissions
 
     # Verify structure
     assert "progress_items" in data
     assert "summary" in data
 
-    # Verify progress items
-    assert len(data["progress_items"]) == 2
-    assert data["progress_items"][0]["unit_id"] == 1
-    assert data["progress_items"][0]["challenge_id"] == 1
-    assert data["progress_items"][1]["unit_id"] == 1
-    assert data["progress_items"][1]["challenge_id"] == 2
-
-    # Verify summary
-    assert data["summary"]["total_points"] == 250  # 100 + 150
-    assert data["summary"]["total_completed"] == 2
-    assert data["summary"]["completion_percentage"] == (2 / 7) * 100
+    # Verify progress items, ordered by unit then challenge
+    assert [
+        (item["unit_id"], item["challenge_id"]) for item in data["progress_items"]
+    ] == [(1, challenge_id) for challenge_id in range(1, n + 1)]
 
 
-def test_get_progress_me_student_empty(client: TestClient):
+def test_get_progress_me_student_empty(client: TestClient, make_user):
     """Test student with no progress returns empty list with zero stats."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
@@ -634,32 +633,15 @@ def test_get_progress_me_student_empty(client: TestClient):
     assert data["summary"]["completion_percentage"] == 0.0
 
 
-def test_get_progress_me_with_multiple_challenges(client: TestClient):
+def test_get_progress_me_with_multiple_challenges(client: TestClient, make_user):
     """Test student retrieves multiple challenges across units."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    _, token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
-    # Define valid queries for each challenge
-    challenges = {
-        (1, 1): "SELECT * FROM users",
-        (1, 2): "SELECT name, email FROM users",
-        (2, 1): "SELECT * FROM users INNER JOIN orders ON users.id = orders.user_id",
-        (3, 1): "SELECT COUNT(*) FROM users",
-    }
-
     # Submit valid challenges
-    for (unit_id, challenge_id), query in challenges.items():
-        client.post(
-            "/progress/submit",
-            headers={"Authorization": f"Bearer {token}"},
-            json={
-                "unit_id": unit_id,
-                "challenge_id": challenge_id,
-                "query": query,
-                "hints_used": 0,
-            },
-        )
+    responses = submit_challenges(client, token, CROSS_UNIT_SUBMISSIONS)
+    assert [r.status_code for r in responses] == [200] * len(CROSS_UNIT_SUBMISSIONS)
 
     response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
 
@@ -685,28 +667,9 @@ def test_get_progress_me_requires_auth(client: TestClient):
     assert response.status_code == 401
 
 
-def test_get_progress_me_contains_summary_stats(client: TestClient):
+def test_get_progress_me_contains_summary_stats(progress_with_one_submission):
     """Test response contains all required summary stat fields."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
-
-    # Submit one challenge
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
-    )
-
-    response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
-
-    assert response.status_code == 200
-    data = response.json()
+    data = progress_with_one_submission
 
     # Verify summary has all fields
     assert "total_points" in data["summary"]
@@ -719,33 +682,15 @@ def test_get_progress_me_contains_summary_stats(client: TestClient):
     assert isinstance(data["summary"]["completion_percentage"], float)
 
 
-def test_get_progress_me_includes_challenge_titles(client: TestClient):
+def test_get_progress_me_includes_challenge_titles(student_with_n_submissions):
     """Test each progress item includes challenge title from CHALLENGES dict."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
+    n, data = student_with_n_submissions
 
-    # Submit challenge 1-1 (title: "SELECT All Columns")
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
-    )
-
-    response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # Verify challenge title is present
-    assert len(data["progress_items"]) == 1
-    assert "challenge_title" in data["progress_items"][0]
-    assert data["progress_items"][0]["challenge_title"] == "SELECT All Columns"
+    assert [item["challenge_title"] for item in data["progress_items"]] == [
+        "SELECT All Columns",
+        "SELECT Specific Columns",
+        "WHERE Clause",
+    ][:n]
 
 
 # ============================================================================
@@ -753,11 +698,11 @@ def test_get_progress_me_includes_challenge_titles(client: TestClient):
 # ============================================================================
 
 
-def test_get_user_progress_teacher_success(client: TestClient, session: Session):
+def test_get_user_progress_teacher_success(client: TestClient, make_user):
     """Test teacher can view any student's progress."""
     # Create student and submit challenges
-    student_token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    student_id, student_token = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     client.post(
@@ -771,18 +716,14 @@ def test_get_user_progress_teacher_success(client: TestClient, session: Session)
         },
     )
 
-    # Get student user_id from database
-    statement = select(User).where(User.email == "student@test.com")
-    student = session.exec(statement).first()
-
     # Create teacher and get token
-    teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+    _, teacher_token = create_teacher_and_get_token(
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Teacher views student progress
     response = client.get(
-        f"/progress/user/{student.id}",
+        f"/progress/user/{student_id}",
         headers={"Authorization": f"Bearer {teacher_token}"},
     )
 
@@ -795,25 +736,21 @@ def test_get_user_progress_teacher_success(client: TestClient, session: Session)
     assert len(data["progress_items"]) == 1
 
 
-def test_get_user_progress_teacher_empty_student(client: TestClient, session: Session):
+def test_get_user_progress_teacher_empty_student(client: TestClient, make_user):
     """Test teacher views student with no progress."""
     # Create student (no submissions)
-    create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    student_id, _ = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
-    # Get student user_id
-    statement = select(User).where(User.email == "student@test.com")
-    student = session.exec(statement).first()
-
     # Create teacher
-    teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+    _, teacher_token = create_teacher_and_get_token(
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Teacher views student progress
     response = client.get(
-        f"/progress/user/{student.id}",
+        f"/progress/user/{student_id}",
         headers={"Authorization": f"Bearer {teacher_token}"},
     )
 
@@ -826,86 +763,65 @@ def test_get_user_progress_teacher_empty_student(client: TestClient, session: Se
     assert data["summary"]["total_completed"] == 0
 
 
-def test_get_user_progress_student_denied(client: TestClient, session: Session):
-    """Test student cannot view another student's progress (403)."""
-    # Create student 1
-    student1_token = create_student_and_get_token(
-        client, "student1@test.com", "password123", "Student 1"
-    )
-
-    # Create student 2
-    create_student_and_get_token(
-        client, "student2@test.com", "password123", "Student 2"
-    )
-
-    # Get student 2's user_id
-    statement = select(User).where(User.email == "student2@test.com")
-    student2 = session.exec(statement).first()
-
-    # Student 1 tries to view student 2's progress
-    response = client.get(
-        f"/progress/user/{student2.id}",
-        headers={"Authorization": f"Bearer {student1_token}"},
-    )
-
-    assert response.status_code == 403
-
+@pytest.fixture
+def two_students(make_user) -> dict:
+    """
+    Two students, keyed by name.
 
-def test_get_user_progress_student_can_view_self(client: TestClient, session: Session):
-    """Test student CAN view their own progress via /user/{their_id}."""
-    # Create student
-    student_token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
+    Returns:
+        Dict mapping "student1"/"student2" to (user id, access token)
+    """
+    return {
+        name: create_student_and_get_token(
+            make_user, f"{name}@test.com", "password123", name
+        )
+        for name in ("student1", "student2")
+    }
 
-    # Submit a challenge
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {student_token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
-    )
 
-    # Get student user_id
-    statement = select(User).where(User.email == "student@test.com")
-    student = session.exec(statement).first()
+@pytest.mark.parametrize(
+    "caller, target",
+    [
+        # A student cannot view another student's progress
+        ("student1", "student2"),
+        # Nor their own: /progress/user/{id} is teacher-only, students use /me
+        ("student1", "student1"),
+    ],
+    ids=["other_student", "self"],
+)
+def test_get_user_progress_student_denied(
+    client: TestClient, two_students, caller, target
+):
+    """Test students cannot use /progress/user/{user_id} (teacher only, 403)."""
+    _, caller_token = two_students[caller]
+    target_id, _ = two_students[target]
 
-    # Student views their own progress via /user/{their_id}
     response = client.get(
-        f"/progress/user/{student.id}",
-        headers={"Authorization": f"Bearer {student_token}"},
+        f"/progress/user/{target_id}",
+        headers={"Authorization": f"Bearer {caller_token}"},
     )
 
-    # Student accessing their own progress should be allowed
-    assert (
-        response.status_code == 403
-    )  # Should be 403 because students can't use /user/{id}
+    assert response.status_code == 403
+    assert "permission" in response.json()["detail"].lower()
 
 
-def test_get_user_progress_requires_auth(client: TestClient, session: Session):
+def test_get_user_progress_requires_auth(client: TestClient, make_user):
     """Test unauthenticated request returns 401."""
     # Create a user to query
-    create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+    student_id, _ = create_student_and_get_token(
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
-    statement = select(User).where(User.email == "student@test.com")
-    student = session.exec(statement).first()
-
     # Request without token
-    response = client.get(f"/progress/user/{student.id}")
+    response = client.get(f"/progress/user/{student_id}")
 
     assert response.status_code == 401
 
 
-def test_get_user_progress_user_not_found(client: TestClient):
+def test_get_user_progress_user_not_found(client: TestClient, make_user):
     """Test requesting non-existent user returns 404."""
-    teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+    _, teacher_token = create_teacher_and_get_token(
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Request non-existent user
@@ -916,61 +832,15 @@ def test_get_user_progress_user_not_found(client: TestClient):
     assert response.status_code == 404
 
 
-def test_get_user_progress_requires_teacher(client: TestClient, session: Session):
-    """Test student cannot use /progress/user/{user_id} endpoint (teacher only)."""
-    # Create student 1
-    student1_token = create_student_and_get_token(
-        client, "student1@test.com", "password123", "Student 1"
-    )
-
-    # Create student 2
-    create_student_and_get_token(
-        client, "student2@test.com", "password123", "Student 2"
-    )
-
-    statement = select(User).where(User.email == "student2@test.com")
-    student2 = session.exec(statement).first()
-
-    # Student tries to access /progress/user/{other_id}
-    response = client.get(
-        f"/progress/user/{student2.id}",
-        headers={"Authorization": f"Bearer {student1_token}"},
-    )
-
-    assert response.status_code == 403
-    data = response.json()
-    assert "permission" in data["detail"].lower()
-
-
 # ============================================================================
 # RESPONSE FORMAT & CALCULATION TESTS
 # ============================================================================
 
 
-def test_progress_response_includes_all_fields(client: TestClient):
+def test_progress_response_includes_all_fields(progress_with_one_submission):
     """Test each progress item includes all required fields."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
-
-    # Submit challenge
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 2,
-        },
-    )
+    data = progress_with_one_submission
 
-    response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # Verify all fields
     required_fields = [
         "id",
         "user_id",
@@ -982,88 +852,26 @@ def test_progress_response_includes_all_fields(client: TestClient):
         "query",
         "challenge_title",
     ]
-    item = data["progress_items"][0]
-    for field in required_fields:
-        assert field in item, f"Missing field: {field}"
-
-    # Verify query field contains submitted query
-    assert item["query"] == "SELECT * FROM users"
-    assert item["hints_used"] == 2
-
-
-def test_progress_summary_stats_calculation(client: TestClient):
-    """Test summary stats are correctly calculated."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
-
-    # Submit 3 challenges: 100 + 150 + 200 = 450 points
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
-    )
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 2,
-            "query": "SELECT name, email FROM users",
-            "hints_used": 0,
-        },
-    )
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 3,
-            "query": "SELECT * FROM users WHERE age > 18",
-            "hints_used": 0,
-        },
-    )
-
-    response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
-
-    assert response.status_code == 200
-    data = response.json()
+    assert len(data["progress_items"]) == 1
+    for item, submission in zip(data["progress_items"], UNIT_ONE_SUBMISSIONS):
+        for field in required_fields:
+            assert field in item, f"Missing field: {field}"
 
-    # Verify calculations
-    assert data["summary"]["total_points"] == 450
-    assert data["summary"]["total_completed"] == 3
-    expected_percentage = (3 / 7) * 100
-    assert data["summary"]["completion_percentage"] == expected_percentage
+        # Verify query and hints match what was submitted
+        assert item["query"] == submission["query"]
+        assert item["hints_used"] == submission["hints_used"]
 
 
-def test_completion_percentage_correct(client: TestClient):
-    """Test completion percentage is correctly calculated as (completed/7)*100."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
+def test_progress_summary_stats_calculation(student_with_n_submissions):
+    """Test summary stats are correctly calculated (100 + 150 + 200 points)."""
+    n, data = student_with_n_submissions
 
-    # Submit 1 challenge
-    client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
-    )
+    assert data["summary"]["total_points"] == sum(UNIT_ONE_POINTS[:n])
+    assert data["summary"]["total_completed"] == n
 
-    response = client.get("/progress/me", headers={"Authorization": f"Bearer {token}"})
 
-    assert response.status_code == 200
-    data = response.json()
+def test_completion_percentage_correct(student_with_n_submissions):
+    """Test completion percentage is completed / TOTAL_CHALLENGES * 100."""
+    n, data = student_with_n_submissions
 
-    # Verify percentage: 1/7 * 100 ≈ 14.285714...
-    expected = (1 / 7) * 100
-    assert abs(data["summary"]["completion_percentage"] - expected) < 0.01
+    assert isclose(data["summary"]["completion_percentage"], _pct(n))
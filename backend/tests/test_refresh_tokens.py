@@ -3,68 +3,23 @@ Test refresh token functionality.
 """
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel, select
-from sqlalchemy.pool import StaticPool
-import pytest
-from unittest.mock import patch
+from freezegun import freeze_time
+from sqlalchemy import bindparam
+from sqlmodel import Session, select
 from datetime import timedelta, datetime, timezone
 
+from app.auth import create_access_token
+
 # Import models at module level so SQLModel knows about them
 from app.models import User, RefreshToken  # noqa: F401
 
+# Fixed clock for tests that assert exact token timestamps
+FROZEN_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
+# Built once; each lookup only binds the token value
+REFRESH_TOKEN_BY_VALUE = select(RefreshToken).where(
+    RefreshToken.token == bindparam("token")
+)
 
 
 # ============================================================================
@@ -73,31 +28,85 @@ def client_fixture(engine):
 
 
 def create_user_and_login(
-    client: TestClient, email: str, password: str, name: str, role: str
+    make_user, email: str, password: str, name: str, role: str
 ) -> dict:
     """
-    Helper function to register and login a user.
+    Helper function to create a user and issue their tokens.
+
+    The user is inserted directly and the tokens are minted the same way
+    /auth/login does, without the register/login round trips.
 
     Args:
-        client: TestClient instance
+        make_user: make_user fixture
         email: User email
         password: User password
         name: User name
         role: User role
 
     Returns:
-        Dict with access_token, refresh_token, token_type
+        Dict with user_id, access_token, refresh_token, token_type
     """
-    # Register user
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": role},
-    )
+    user, access_token, refresh_token = make_user(email, name, role, password)
+    return {
+        "user_id": user.id,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
 
-    # Login and get tokens
-    response = client.post("/auth/login", json={"email": email, "password": password})
 
-    return response.json()
+def get_refresh_token(session: Session, token: str) -> RefreshToken | None:
+    """
+    Helper function to load the stored row for a refresh token string.
+
+    Args:
+        session: Database session
+        token: Refresh token string
+
+    Returns:
+        RefreshToken row, or None if the token was never stored
+    """
+    return session.exec(REFRESH_TOKEN_BY_VALUE, params={"token": token}).first()
+
+
+def seed_refresh_tokens(
+    session: Session,
+    user_id: int,
+    n: int,
+    *,
+    expired: bool = False,
+    revoked: bool = False,
+) -> list[str]:
+    """
+    Helper function to store several refresh tokens for a user in one commit.
+
+    Args:
+        session: Database session
+        user_id: Owner of the tokens
+        n: Number of tokens to create
+        expired: Issue tokens that expired a day ago instead of in 7 days
+        revoked: Mark the tokens as revoked
+
+    Returns:
+        List of refresh token strings
+    """
+    expires_delta = timedelta(days=-1) if expired else timedelta(days=7)
+    tokens = [
+        create_access_token(
+            data={"sub": str(user_id), "type": "refresh"},
+            expires_delta=expires_delta,
+        )
+        for _ in range(n)
+    ]
+    expires_at = datetime.now(timezone.utc) + expires_delta
+    session.add_all(
+        RefreshToken(
+            token=token, user_id=user_id, expires_at=expires_at, revoked=revoked
+        )
+        for token in tokens
+    )
+    session.commit()
+    return tokens
 
 
 # ============================================================================
@@ -151,31 +160,43 @@ def test_login_returns_both_tokens(client: TestClient):
 
 def test_refresh_token_is_stored_in_database(client: TestClient, session: Session):
     """Test that refresh token is stored in database after login."""
-    tokens = create_user_and_login(
-        client, "storage@test.com", "password123", "Storage Test", "student"
+    # Go through the real endpoints: this is what /auth/login persists
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "email": "storage@test.com",
+            "name": "Storage Test",
+            "password": "password123",
+            "role": "student",
+        },
+    )
+    response = client.post(
+        "/auth/login", json={"email": "storage@test.com", "password": "password123"}
     )
 
-    refresh_token = tokens["refresh_token"]
+    refresh_token = response.json()["refresh_token"]
 
     # Query database for refresh token
-    statement = select(RefreshToken).where(RefreshToken.token == refresh_token)
-    db_token = session.exec(statement).first()
+    db_token = get_refresh_token(session, refresh_token)
 
     # Token should exist
     assert db_token is not None
     assert db_token.token == refresh_token
-    assert db_token.user_id == 1  # First user
+    assert db_token.user_id == register_response.json()["id"]
     assert db_token.revoked is False
     assert db_token.expires_at is not None
 
 
-def test_refresh_token_has_correct_expiration(client: TestClient, session: Session):
-    """Test that refresh token has correct expiration (~7 days)."""
+@freeze_time(FROZEN_NOW)
+def test_refresh_token_has_correct_expiration(
+    client: TestClient, session: Session, make_user
+):
+    """Test that refresh token expires exactly 7 days after it is issued."""
     from jose import jwt
     from app.auth import SECRET_KEY, ALGORITHM
 
     tokens = create_user_and_login(
-        client, "expiry@test.com", "password123", "Expiry Test", "teacher"
+        make_user, "expiry@test.com", "password123", "Expiry Test", "teacher"
     )
 
     refresh_token = tokens["refresh_token"]
@@ -186,14 +207,8 @@ def test_refresh_token_has_correct_expiration(client: TestClient, session: Sessi
     assert "exp" in payload
     assert "sub" in payload  # User ID in subject
 
-    # Check expiration is roughly 7 days from now
-    exp_timestamp = payload["exp"]
-    exp_datetime = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
-    now = datetime.now(timezone.utc)
-    time_diff = exp_datetime - now
-
-    # Should be between 6.9 and 7.1 days
-    assert 6.9 * 24 * 60 * 60 < time_diff.total_seconds() < 7.1 * 24 * 60 * 60
+    # The clock is frozen, so the expiry is exact
+    assert payload["exp"] == int((FROZEN_NOW + timedelta(days=7)).timestamp())
 
 
 # ============================================================================
@@ -201,10 +216,13 @@ def test_refresh_token_has_correct_expiration(client: TestClient, session: Sessi
 # ============================================================================
 
 
-def test_refresh_with_valid_token_success(client: TestClient):
+def test_refresh_with_valid_token_success(client: TestClient, make_user):
     """Test refreshing access token with valid refresh token."""
+    from jose import jwt
+    from app.auth import SECRET_KEY, ALGORITHM
+
     tokens = create_user_and_login(
-        client, "refresh@test.com", "password123", "Refresh Test", "student"
+        make_user, "refresh@test.com", "password123", "Refresh Test", "student"
     )
 
     refresh_token = tokens["refresh_token"]
@@ -224,11 +242,12 @@ def test_refresh_with_valid_token_success(client: TestClient):
     # New access token should be different from original
     assert data["access_token"] != original_access_token
 
-    # New access token should work for protected endpoints
-    me_response = client.get(
-        "/users/me", headers={"Authorization": f"Bearer {data['access_token']}"}
-    )
-    assert me_response.status_code == 200
+    # New access token should carry the same claims as one issued at login
+    payload = jwt.decode(data["access_token"], SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["sub"] == "refresh@test.com"
+    assert payload["user_id"] == tokens["user_id"]
+    assert payload["role"] == "student"
+    assert "exp" in payload
 
 
 def test_refresh_with_invalid_token(client: TestClient):
@@ -239,36 +258,12 @@ def test_refresh_with_invalid_token(client: TestClient):
     assert "detail" in response.json()
 
 
-def test_refresh_with_expired_token(client: TestClient, session: Session):
+def test_refresh_with_expired_token(client: TestClient, session: Session, make_user):
     """Test refresh with expired token."""
-    from app.auth import create_access_token
+    user, _, _ = make_user("expired@test.com", "Expired Test")
 
-    # Create user
-    client.post(
-        "/auth/register",
-        json={
-            "email": "expired@test.com",
-            "name": "Expired Test",
-            "password": "password123",
-            "role": "student",
-        },
-    )
-
-    # Create expired refresh token
-    expired_token = create_access_token(
-        data={"sub": "1", "type": "refresh"},
-        expires_delta=timedelta(days=-1),  # Already expired
-    )
-
-    # Store in database
-    db_token = RefreshToken(
-        token=expired_token,
-        user_id=1,
-        expires_at=datetime.now(timezone.utc) - timedelta(days=1),
-        revoked=False,
-    )
-    session.add(db_token)
-    session.commit()
+    # Create and store an already-expired refresh token
+    [expired_token] = seed_refresh_tokens(session, user.id, 1, expired=True)
 
     # Try to refresh with expired token
     response = client.post("/auth/refresh", json={"refresh_token": expired_token})
@@ -277,17 +272,16 @@ def test_refresh_with_expired_token(client: TestClient, session: Session):
     assert "detail" in response.json()
 
 
-def test_refresh_with_revoked_token(client: TestClient, session: Session):
+def test_refresh_with_revoked_token(client: TestClient, session: Session, make_user):
     """Test refresh with revoked token."""
     tokens = create_user_and_login(
-        client, "revoked@test.com", "password123", "Revoked Test", "student"
+        make_user, "revoked@test.com", "password123", "Revoked Test", "student"
     )
 
     refresh_token = tokens["refresh_token"]
 
     # Manually revoke token in database
-    statement = select(RefreshToken).where(RefreshToken.token == refresh_token)
-    db_token = session.exec(statement).first()
+    db_token = get_refresh_token(session, refresh_token)
     db_token.revoked = True
     session.add(db_token)
     session.commit()
@@ -303,8 +297,6 @@ def test_refresh_with_revoked_token(client: TestClient, session: Session):
 
 def test_refresh_with_nonexistent_token(client: TestClient):
     """Test refresh with valid JWT but not in database."""
-    from app.auth import create_access_token
-
     # Create valid JWT but don't store in database
     fake_token = create_access_token(
         data={"sub": "999", "type": "refresh"}, expires_delta=timedelta(days=7)
@@ -316,17 +308,16 @@ def test_refresh_with_nonexistent_token(client: TestClient):
     assert response.status_code == 401
 
 
-def test_refresh_with_deleted_user(client: TestClient, session: Session):
+def test_refresh_with_deleted_user(client: TestClient, session: Session, make_user):
     """Test refresh when user has been deleted."""
     tokens = create_user_and_login(
-        client, "deleted@test.com", "password123", "Deleted User", "student"
+        make_user, "deleted@test.com", "password123", "Deleted User", "student"
     )
 
     refresh_token = tokens["refresh_token"]
 
     # Delete user from database
-    statement = select(User).where(User.email == "deleted@test.com")
-    user = session.exec(statement).first()
+    user = session.get(User, tokens["user_id"])
     session.delete(user)
     session.commit()
 
@@ -341,10 +332,10 @@ def test_refresh_with_deleted_user(client: TestClient, session: Session):
 # ============================================================================
 
 
-def test_logout_revokes_token(client: TestClient, session: Session):
+def test_logout_revokes_token(client: TestClient, session: Session, make_user):
     """Test that logout revokes the refresh token."""
     tokens = create_user_and_login(
-        client, "logout@test.com", "password123", "Logout Test", "student"
+        make_user, "logout@test.com", "password123", "Logout Test", "student"
     )
 
     refresh_token = tokens["refresh_token"]
@@ -357,15 +348,14 @@ def test_logout_revokes_token(client: TestClient, session: Session):
     assert "message" in data
 
     # Check token is revoked in database
-    statement = select(RefreshToken).where(RefreshToken.token == refresh_token)
-    db_token = session.exec(statement).first()
+    db_token = get_refresh_token(session, refresh_token)
     assert db_token.revoked is True
 
 
-def test_logout_prevents_future_refresh(client: TestClient):
+def test_logout_prevents_future_refresh(client: TestClient, make_user):
     """Test that after logout, token cannot be used for refresh."""
     tokens = create_user_and_login(
-        client, "prevent@test.com", "password123", "Prevent Test", "student"
+        make_user, "prevent@test.com", "password123", "Prevent Test", "student"
     )
 
     refresh_token = tokens["refresh_token"]
@@ -390,10 +380,10 @@ def test_logout_with_invalid_token(client: TestClient):
     assert response.status_code == 401
 
 
-def test_logout_with_already_revoked_token(client: TestClient):
+def test_logout_with_already_revoked_token(client: TestClient, make_user):
     """Test logout with already revoked token (idempotent)."""
     tokens = create_user_and_login(
-        client, "idempotent@test.com", "password123", "Idempotent Test", "student"
+        make_user, "idempotent@test.com", "password123", "Idempotent Test", "student"
     )
 
     refresh_token = tokens["refresh_token"]
@@ -3,74 +3,35 @@ Test weekly progress reports - aggregated metrics for teachers.
 """
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel, select
-from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, select
 import pytest
-from unittest.mock import patch
 from datetime import datetime, timedelta, timezone
 
 # Import models at module level so SQLModel knows about them
 from app.models import User, Progress  # noqa: F401
+from app.routes.reports import invalidate_weekly_cache
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
+# A correct query for each (unit_id, challenge_id)
+VALID_QUERIES = {
+    (1, 1): "SELECT * FROM users",
+    (1, 2): "SELECT name, email FROM users",
+    (1, 3): "SELECT * FROM users WHERE age > 18",
+    (2, 1): "SELECT * FROM users INNER JOIN orders ON users.id = orders.user_id",
+    (2, 2): "SELECT * FROM users LEFT JOIN orders ON users.id = orders.user_id",
+    (3, 1): "SELECT COUNT(*) FROM users",
+    (3, 2): "SELECT role, COUNT(*) FROM users GROUP BY role",
+}
 
 
-@pytest.fixture(name="session")
-def session_fixture(engine):
+@pytest.fixture(autouse=True)
+def clear_weekly_cache():
     """
-    Create a database session for direct database access in tests.
+    Start and finish every test with an empty weekly report cache.
     """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-        from app.routes.reports import invalidate_weekly_cache
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-
-        # Clear cache before test
-        invalidate_weekly_cache()
-
-        yield client
-
-        app.dependency_overrides.clear()
-        invalidate_weekly_cache()
+    invalidate_weekly_cache()
+    yield
+    invalidate_weekly_cache()
 
 
 # ============================================================================
@@ -79,27 +40,19 @@ def client_fixture(engine):
 
 
 def create_student_and_get_token(
-    client: TestClient, email: str, password: str, name: str
+    make_user, email: str, password: str, name: str
 ) -> str:
-    """Helper to create a student and get their JWT token."""
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": "student"},
-    )
-    response = client.post("/auth/login", json={"email": email, "password": password})
-    return response.json()["access_token"]
+    """Helper to insert a student directly and get their JWT token."""
+    _, token, _ = make_user(email, name=name, role="student", password=password)
+    return token
 
 
 def create_teacher_and_get_token(
-    client: TestClient, email: str, password: str, name: str
+    make_user, email: str, password: str, name: str
 ) -> str:
-    """Helper to create a teacher and get their JWT token."""
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": "teacher"},
-    )
-    response = client.post("/auth/login", json={"email": email, "password": password})
-    return response.json()["access_token"]
+    """Helper to insert a teacher directly and get their JWT token."""
+    _, token, _ = make_user(email, name=name, role="teacher", password=password)
+    return token
 
 
 def submit_challenge(
@@ -110,20 +63,9 @@ def submit_challenge(
     query: str = None,
 ):
     """Helper to submit a challenge with valid query for the challenge."""
-    # Map of valid queries for each challenge
-    valid_queries = {
-        (1, 1): "SELECT * FROM users",
-        (1, 2): "SELECT name, email FROM users",
-        (1, 3): "SELECT * FROM users WHERE age > 18",
-        (2, 1): "SELECT * FROM users INNER JOIN orders ON users.id = orders.user_id",
-        (2, 2): "SELECT * FROM users LEFT JOIN orders ON users.id = orders.user_id",
-        (3, 1): "SELECT COUNT(*) FROM users",
-        (3, 2): "SELECT role, COUNT(*) FROM users GROUP BY role",
-    }
-
     # Use provided query or lookup valid query for this challenge
     if query is None:
-        query = valid_queries.get((unit_id, challenge_id), "SELECT * FROM users")
+        query = VALID_QUERIES.get((unit_id, challenge_id), "SELECT * FROM users")
 
     return client.post(
         "/progress/submit",
@@ -142,10 +84,10 @@ def submit_challenge(
 # ============================================================================
 
 
-def test_weekly_report_endpoint_exists(client: TestClient):
+def test_weekly_report_endpoint_exists(client: TestClient, make_user):
     """Test GET /reports/weekly endpoint returns 200."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     response = client.get(
@@ -162,10 +104,10 @@ def test_weekly_report_requires_authentication(client: TestClient):
     assert response.status_code == 401
 
 
-def test_weekly_report_requires_teacher_role(client: TestClient):
+def test_weekly_report_requires_teacher_role(client: TestClient, make_user):
     """Test students cannot access /reports/weekly (403)."""
     student_token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     response = client.get(
@@ -176,10 +118,10 @@ def test_weekly_report_requires_teacher_role(client: TestClient):
     assert response.status_code == 403
 
 
-def test_weekly_report_returns_structured_data(client: TestClient):
+def test_weekly_report_returns_structured_data(client: TestClient, make_user):
     """Test response includes all required fields."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     response = client.get(
@@ -208,22 +150,24 @@ def test_weekly_report_returns_structured_data(client: TestClient):
 # ============================================================================
 
 
-def test_weekly_report_counts_active_students(client: TestClient, session: Session):
+def test_weekly_report_counts_active_students(
+    client: TestClient, make_user, session: Session
+):
     """Test reports only counts students with activity in past 7 days."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Create 3 students
     token1 = create_student_and_get_token(
-        client, "student1@test.com", "password123", "Student 1"
+        make_user, "student1@test.com", "password123", "Student 1"
     )
     token2 = create_student_and_get_token(
-        client, "student2@test.com", "password123", "Student 2"
+        make_user, "student2@test.com", "password123", "Student 2"
     )
     # Create student 3 but don't store token (doesn't submit)
     create_student_and_get_token(
-        client, "student3@test.com", "password123", "Student 3"
+        make_user, "student3@test.com", "password123", "Student 3"
     )
 
     # Student 1 and 2 submit challenges (recent)
@@ -242,14 +186,14 @@ def test_weekly_report_counts_active_students(client: TestClient, session: Sessi
     assert data["students_active"] == 2
 
 
-def test_weekly_report_calculates_total_completions(client: TestClient):
+def test_weekly_report_calculates_total_completions(client: TestClient, make_user):
     """Test total completions sums all challenges in week."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit 3 different challenges
@@ -269,17 +213,17 @@ def test_weekly_report_calculates_total_completions(client: TestClient):
     assert data["total_completions"] == 3
 
 
-def test_weekly_report_calculates_avg_points(client: TestClient):
+def test_weekly_report_calculates_avg_points(client: TestClient, make_user):
     """Test avg_points_per_student = total_points / active_students."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     token1 = create_student_and_get_token(
-        client, "student1@test.com", "password123", "Student 1"
+        make_user, "student1@test.com", "password123", "Student 1"
     )
     token2 = create_student_and_get_token(
-        client, "student2@test.com", "password123", "Student 2"
+        make_user, "student2@test.com", "password123", "Student 2"
     )
 
     # Student 1: 100 points (1 challenge)
@@ -300,14 +244,16 @@ def test_weekly_report_calculates_avg_points(client: TestClient):
     assert data["avg_points_per_student"] == 125.0
 
 
-def test_weekly_report_filters_by_7_day_window(client: TestClient, session: Session):
+def test_weekly_report_filters_by_7_day_window(
+    client: TestClient, make_user, session: Session
+):
     """Test only includes progress from past 7 days."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit a recent challenge via API
@@ -347,16 +293,16 @@ def test_weekly_report_filters_by_7_day_window(client: TestClient, session: Sess
 # ============================================================================
 
 
-def test_weekly_report_top_performers_max_5(client: TestClient):
+def test_weekly_report_top_performers_max_5(client: TestClient, make_user):
     """Test returns max 5 top performers."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Create 8 students
     for i in range(8):
         token = create_student_and_get_token(
-            client, f"student{i}@test.com", "password123", f"Student {i}"
+            make_user, f"student{i}@test.com", "password123", f"Student {i}"
         )
         # Each submits 1 challenge
         submit_challenge(client, token, 1, 1)
@@ -373,10 +319,10 @@ def test_weekly_report_top_performers_max_5(client: TestClient):
     assert len(data["top_performers"]) <= 5
 
 
-def test_weekly_report_top_performers_correct_order(client: TestClient):
+def test_weekly_report_top_performers_correct_order(client: TestClient, make_user):
     """Test top performers ordered by points DESC."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Create students with different point totals
@@ -384,7 +330,7 @@ def test_weekly_report_top_performers_correct_order(client: TestClient):
     tokens = []
     for i in range(4):
         token = create_student_and_get_token(
-            client,
+            make_user,
             f"student{i}@test.com",
             "password123",
             f"Student {i}",
@@ -414,10 +360,10 @@ def test_weekly_report_top_performers_correct_order(client: TestClient):
     assert top[3]["points_this_week"] == 100
 
 
-def test_weekly_report_empty_when_no_data(client: TestClient):
+def test_weekly_report_empty_when_no_data(client: TestClient, make_user):
     """Test returns empty lists if no student activity."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     response = client.get(
@@ -440,28 +386,28 @@ def test_weekly_report_empty_when_no_data(client: TestClient):
 # ============================================================================
 
 
-def test_weekly_report_identifies_struggling_students(client: TestClient):
+def test_weekly_report_identifies_struggling_students(client: TestClient, make_user):
     """Test identifies students with <3 completions as struggling."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Student 1: 1 completion (struggling)
     token1 = create_student_and_get_token(
-        client, "student1@test.com", "password123", "Student 1"
+        make_user, "student1@test.com", "password123", "Student 1"
     )
     submit_challenge(client, token1, 1, 1)
 
     # Student 2: 2 completions (struggling)
     token2 = create_student_and_get_token(
-        client, "student2@test.com", "password123", "Student 2"
+        make_user, "student2@test.com", "password123", "Student 2"
     )
     submit_challenge(client, token2, 1, 1)
     submit_challenge(client, token2, 1, 2)
 
     # Student 3: 3 completions (not struggling)
     token3 = create_student_and_get_token(
-        client, "student3@test.com", "password123", "Student 3"
+        make_user, "student3@test.com", "password123", "Student 3"
     )
     submit_challenge(client, token3, 1, 1)
     submit_challenge(client, token3, 1, 2)
@@ -479,14 +425,14 @@ def test_weekly_report_identifies_struggling_students(client: TestClient):
     assert len(data["struggling_students"]) == 2
 
 
-def test_weekly_report_includes_student_name_and_stats(client: TestClient):
+def test_weekly_report_includes_student_name_and_stats(client: TestClient, make_user):
     """Test struggling students include name and stats."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
     submit_challenge(client, token, 1, 1)
 
@@ -510,15 +456,15 @@ def test_weekly_report_includes_student_name_and_stats(client: TestClient):
     assert student["points_this_week"] == 100
 
 
-def test_weekly_report_excludes_teacher_completions(client: TestClient):
+def test_weekly_report_excludes_teacher_completions(client: TestClient, make_user):
     """Test only counts student progress, not teacher progress."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     # Student submits 1 challenge
     student_token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
     submit_challenge(client, student_token, 1, 1)
 
@@ -543,14 +489,14 @@ def test_weekly_report_excludes_teacher_completions(client: TestClient):
 # ============================================================================
 
 
-def test_weekly_report_cache_returns_same_data(client: TestClient):
+def test_weekly_report_cache_returns_same_data(client: TestClient, make_user):
     """Test caching returns same data on repeated calls."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
     submit_challenge(client, token, 1, 1)
 
@@ -574,14 +520,14 @@ def test_weekly_report_cache_returns_same_data(client: TestClient):
     assert data1["generated_at"] == data2["generated_at"]
 
 
-def test_weekly_report_timestamp_consistent_during_cache(client: TestClient):
+def test_weekly_report_timestamp_consistent_during_cache(client: TestClient, make_user):
     """Test generated_at timestamp stays consistent while cached."""
     teacher_token = create_teacher_and_get_token(
-        client, "teacher@test.com", "password123", "Test Teacher"
+        make_user, "teacher@test.com", "password123", "Test Teacher"
     )
 
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
     submit_challenge(client, token, 1, 1)
 
@@ -3,83 +3,29 @@ Test detailed student view for teachers.
 Tests GET /users/{user_id}?detailed=true endpoint.
 """
 
-from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlalchemy.pool import StaticPool
 import pytest
-from unittest.mock import patch
+from fastapi.testclient import TestClient
 
 # Import models at module level so SQLModel knows about them
 from app.models import User, Progress, Attempt, Hint  # noqa: F401
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
-
-
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 
 def create_user_and_get_token(
-    client: TestClient, email: str, password: str, name: str, role: str
+    make_user, email: str, password: str, name: str, role: str
 ) -> str:
     """
-    Helper function to register a user and get their JWT token.
+    Helper function to create a user and get their JWT token.
+
+    The user is inserted directly instead of going through /auth/register
+    and /auth/login.
 
     Args:
-        client: TestClient instance
+        make_user: make_user fixture
         email: User email
         password: User password
         name: User name
@@ -88,36 +34,19 @@ def create_user_and_get_token(
     Returns:
         JWT access token string
     """
-    # Register user
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": role},
-    )
+    _, token, _ = make_user(email, name=name, role=role, password=password)
+    return token
 
-    # Login and get token
-    response = client.post("/auth/login", json={"email": email, "password": password})
 
-    return response.json()["access_token"]
-
-
-def create_student_with_progress(client: TestClient) -> tuple[str, int]:
+def create_student_with_progress(client: TestClient, make_user) -> tuple[str, int]:
     """
     Create a student and add progress with attempts and hints.
     Returns (student_token, student_id).
     """
-    # Create teacher and student
-    create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-    student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+    student, student_token, _ = make_user(
+        "student@test.com", name="Student", password="password123"
     )
-
-    # Get student ID (should be 2 since teacher is 1)
-    response = client.get(
-        "/users/me", headers={"Authorization": f"Bearer {student_token}"}
-    )
-    student_id = response.json()["id"]
+    student_id = student.id
 
     # Submit challenges with correct answers
     # Challenge (1,1): 100 points
@@ -169,18 +98,39 @@ def create_student_with_progress(client: TestClient) -> tuple[str, int]:
     return student_token, student_id
 
 
+@pytest.fixture
+def student_detail(client, make_user):
+    """
+    A teacher's detailed view of the student from create_student_with_progress.
+
+    Returns:
+        Tuple of (student_id, detailed response data)
+    """
+    _, student_id = create_student_with_progress(client, make_user)
+    teacher_token = create_user_and_get_token(
+        make_user, "teacher@test.com", "password123", "Teacher", "teacher"
+    )
+
+    response = client.get(
+        f"/users/{student_id}?detailed=true",
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+    assert response.status_code == 200
+    return student_id, response.json()
+
+
 # ============================================================================
 # PERMISSION TESTS
 # ============================================================================
 
 
-def test_teacher_can_view_student_detail(client: TestClient):
+def test_teacher_can_view_student_detail(client: TestClient, make_user):
     """Test that teacher can view detailed student view."""
-    student_token, student_id = create_student_with_progress(client)
+    _, student_id = create_student_with_progress(client, make_user)
 
     # Create second teacher
     teacher_token = create_user_and_get_token(
-        client, "teacher2@test.com", "password123", "Teacher 2", "teacher"
+        make_user, "teacher2@test.com", "password123", "Teacher 2", "teacher"
     )
 
     # Teacher views student detail
@@ -197,14 +147,14 @@ def test_teacher_can_view_student_detail(client: TestClient):
     assert "activity_log" in data
 
 
-def test_student_cannot_view_other_student_detail(client: TestClient):
+def test_student_cannot_view_other_student_detail(client: TestClient, make_user):
     """Test that student gets 403 when viewing another student's detail."""
     # Create two students
     student1_token = create_user_and_get_token(
-        client, "student1@test.com", "password123", "Student One", "student"
+        make_user, "student1@test.com", "password123", "Student One", "student"
     )
     student2_token = create_user_and_get_token(
-        client, "student2@test.com", "password123", "Student Two", "student"
+        make_user, "student2@test.com", "password123", "Student Two", "student"
     )
 
     # Get student2 ID
@@ -227,22 +177,9 @@ def test_student_cannot_view_other_student_detail(client: TestClient):
 # ============================================================================
 
 
-def test_detail_response_has_required_fields(client: TestClient):
+def test_detail_response_has_required_fields(student_detail):
     """Test that detail response has all required top-level fields."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Check required fields
     assert "user" in data
@@ -257,22 +194,9 @@ def test_detail_response_has_required_fields(client: TestClient):
     assert isinstance(data["activity_log"], list)
 
 
-def test_units_properly_nested(client: TestClient):
+def test_units_properly_nested(student_detail):
     """Test that units contain challenges with proper nesting."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Check unit structure
     units = data["units"]
@@ -295,22 +219,9 @@ def test_units_properly_nested(client: TestClient):
             assert "hints" in challenge
 
 
-def test_activity_log_has_max_10_items(client: TestClient):
+def test_activity_log_has_max_10_items(student_detail):
     """Test that activity log is limited to 10 most recent actions."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     activity_log = data["activity_log"]
     assert len(activity_log) <= 10
@@ -321,22 +232,9 @@ def test_activity_log_has_max_10_items(client: TestClient):
 # ============================================================================
 
 
-def test_detail_includes_user_basic_info(client: TestClient):
+def test_detail_includes_user_basic_info(student_detail):
     """Test that detail includes basic user information."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    student_id, data = student_detail
     user = data["user"]
 
     # Check basic user fields
@@ -347,22 +245,9 @@ def test_detail_includes_user_basic_info(client: TestClient):
     assert "created_at" in user
 
 
-def test_detail_includes_enrollment_metrics(client: TestClient):
+def test_detail_includes_enrollment_metrics(student_detail):
     """Test that detail includes enrollment metrics (total points, challenges)."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
     metrics = data["metrics"]
 
     # Check metrics fields
@@ -383,22 +268,9 @@ def test_detail_includes_enrollment_metrics(client: TestClient):
 # ============================================================================
 
 
-def test_units_ordered_by_id(client: TestClient):
+def test_units_ordered_by_id(student_detail):
     """Test that units are ordered by unit_id."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
     units = data["units"]
 
     # Extract unit IDs
@@ -408,22 +280,9 @@ def test_units_ordered_by_id(client: TestClient):
     assert unit_ids == sorted(unit_ids)
 
 
-def test_challenges_within_unit_ordered(client: TestClient):
+def test_challenges_within_unit_ordered(student_detail):
     """Test that challenges within a unit are ordered by challenge_id."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
     units = data["units"]
 
     # Check ordering within each unit
@@ -432,22 +291,9 @@ def test_challenges_within_unit_ordered(client: TestClient):
         assert challenge_ids == sorted(challenge_ids)
 
 
-def test_includes_all_units_even_incomplete(client: TestClient):
+def test_includes_all_units_even_incomplete(student_detail):
     """Test that response includes all 3 units even if some are incomplete."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
     units = data["units"]
 
     # Should have all 3 units
@@ -463,22 +309,9 @@ def test_includes_all_units_even_incomplete(client: TestClient):
 # ============================================================================
 
 
-def test_challenge_shows_all_attempts(client: TestClient):
+def test_challenge_shows_all_attempts(student_detail):
     """Test that challenge shows all attempts (correct and incorrect)."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Find unit 1, challenge 2 (should have 2 attempts: 1 wrong, 1 correct)
     unit1 = next(u for u in data["units"] if u["unit_id"] == 1)
@@ -488,22 +321,9 @@ def test_challenge_shows_all_attempts(client: TestClient):
     assert len(challenge2["attempts"]) == 2
 
 
-def test_attempts_include_query_and_result(client: TestClient):
+def test_attempts_include_query_and_result(student_detail):
     """Test that each attempt includes query and result."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Find a challenge with attempts
     unit1 = next(u for u in data["units"] if u["unit_id"] == 1)
@@ -518,22 +338,9 @@ def test_attempts_include_query_and_result(client: TestClient):
         assert isinstance(attempt["is_correct"], bool)
 
 
-def test_attempts_ordered_chronologically(client: TestClient):
+def test_attempts_ordered_chronologically(student_detail):
     """Test that attempts are ordered chronologically (oldest first)."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Find a challenge with multiple attempts
     unit1 = next(u for u in data["units"] if u["unit_id"] == 1)
@@ -549,22 +356,9 @@ def test_attempts_ordered_chronologically(client: TestClient):
 # ============================================================================
 
 
-def test_success_rate_calculated_correctly(client: TestClient):
+def test_success_rate_calculated_correctly(student_detail):
     """Test that success rate is calculated correctly."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Find challenge (1,2) which has 2 attempts (1 wrong, 1 correct)
     unit1 = next(u for u in data["units"] if u["unit_id"] == 1)
@@ -578,22 +372,9 @@ def test_success_rate_calculated_correctly(client: TestClient):
     assert metrics["correct_attempts"] == 1
 
 
-def test_avg_attempts_per_challenge(client: TestClient):
+def test_avg_attempts_per_challenge(student_detail):
     """Test that average attempts per challenge is calculated correctly."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
     metrics = data["metrics"]
 
     # Total: 4 attempts across 3 challenges = 1.33...
@@ -603,22 +384,9 @@ def test_avg_attempts_per_challenge(client: TestClient):
     assert abs(metrics["average_attempts_per_challenge"] - expected_avg) < 0.01
 
 
-def test_challenge_metrics_include_success_rate(client: TestClient):
+def test_challenge_metrics_include_success_rate(student_detail):
     """Test that per-challenge metrics include success rate."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Check all challenges have metrics with success_rate
     for unit in data["units"]:
@@ -633,22 +401,9 @@ def test_challenge_metrics_include_success_rate(client: TestClient):
 # ============================================================================
 
 
-def test_hint_usage_statistics(client: TestClient):
+def test_hint_usage_statistics(student_detail):
     """Test that hint usage statistics are included."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Check overall hint usage
     metrics = data["metrics"]
@@ -656,22 +411,9 @@ def test_hint_usage_statistics(client: TestClient):
     assert isinstance(metrics["total_hints_used"], int)
 
 
-def test_hints_accessed_before_completion(client: TestClient):
+def test_hints_accessed_before_completion(student_detail):
     """Test that hint access records are shown for challenges."""
-    student_token, student_id = create_student_with_progress(client)
-
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
-    response = client.get(
-        f"/users/{student_id}?detailed=true",
-        headers={"Authorization": f"Bearer {teacher_token}"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+    _, data = student_detail
 
     # Check that challenges have hints list (even if empty)
     for unit in data["units"]:
@@ -2,69 +2,17 @@
 Test protected user endpoints.
 """
 
-from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel, select
-from sqlalchemy.pool import StaticPool
 import pytest
-from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
 from datetime import timedelta
+from jose import jwt
+
+from app.auth import ALGORITHM, SECRET_KEY, create_access_token, hash_password
 
 # Import models at module level so SQLModel knows about them
 from app.models import User  # noqa: F401
-
-
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
+from app.schemas import StudentListResponse
 
 
 # ============================================================================
@@ -73,13 +21,16 @@ def client_fixture(engine):
 
 
 def create_user_and_get_token(
-    client: TestClient, email: str, password: str, name: str, role: str
+    make_user, email: str, password: str, name: str, role: str
 ) -> str:
     """
-    Helper function to register a user and get their JWT token.
+    Helper function to create a user and get their JWT token.
+
+    The user is inserted directly instead of going through /auth/register
+    and /auth/login.
 
     Args:
-        client: TestClient instance
+        make_user: make_user fixture
         email: User email
         password: User password
         name: User name
@@ -88,16 +39,38 @@ def create_user_and_get_token(
     Returns:
         JWT access token string
     """
-    # Register user
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": role},
+    _, token, _ = make_user(email, name=name, role=role, password=password)
+    return token
+
+
+def seed_users(session: Session, users: list[tuple[str, str, str]]) -> None:
+    """
+    Insert users that a test never logs in as, in one commit.
+
+    Args:
+        session: Database session
+        users: (email, name, role) for each user, in insertion order
+    """
+    password_hash = hash_password("password123")
+    session.add_all(
+        [
+            User(email=email, name=name, role=role, password_hash=password_hash)
+            for email, name, role in users
+        ]
     )
+    session.commit()
+
 
-    # Login and get token
-    response = client.post("/auth/login", json={"email": email, "password": password})
+@pytest.fixture
+def teacher_token(make_user) -> str:
+    """
+    Access token for a teacher created before anything else in the test.
 
-    return response.json()["access_token"]
+    The teacher is always the first user, so it has id 1.
+    """
+    return create_user_and_get_token(
+        make_user, "teacher@test.com", "password123", "Teacher", "teacher"
+    )
 
 
 # ============================================================================
@@ -105,11 +78,11 @@ def create_user_and_get_token(
 # ============================================================================
 
 
-def test_get_current_user_success(client: TestClient):
+def test_get_current_user_success(client: TestClient, make_user):
     """Test getting current user with valid token."""
     # Create user and get token
     token = create_user_and_get_token(
-        client, "current@test.com", "password123", "Current User", "student"
+        make_user, "current@test.com", "password123", "Current User", "student"
     )
 
     # Get current user with token
@@ -130,14 +103,6 @@ def test_get_current_user_success(client: TestClient):
     assert "password_hash" not in data
 
 
-def test_get_current_user_no_token(client: TestClient):
-    """Test getting current user without authentication token."""
-    response = client.get("/users/me")
-
-    assert response.status_code == 401
-    assert "detail" in response.json()
-
-
 def test_get_current_user_invalid_token(client: TestClient):
     """Test getting current user with malformed/invalid token."""
     response = client.get(
@@ -152,8 +117,6 @@ def test_get_current_user_invalid_token(client: TestClient):
 
 def test_get_current_user_expired_token(client: TestClient):
     """Test getting current user with expired token."""
-    from app.auth import create_access_token
-
     # Create user first
     client.post(
         "/auth/register",
@@ -180,11 +143,13 @@ def test_get_current_user_expired_token(client: TestClient):
     assert "detail" in response.json()
 
 
-def test_get_current_user_token_for_deleted_user(client: TestClient, session: Session):
+def test_get_current_user_token_for_deleted_user(
+    client: TestClient, make_user, session: Session
+):
     """Test using valid token after user has been deleted."""
     # Create user and get token
     token = create_user_and_get_token(
-        client, "deleted@test.com", "password123", "Deleted User", "student"
+        make_user, "deleted@test.com", "password123", "Deleted User", "student"
     )
 
     # Delete user from database
@@ -200,11 +165,11 @@ def test_get_current_user_token_for_deleted_user(client: TestClient, session: Se
     assert "detail" in response.json()
 
 
-def test_get_current_user_malformed_authorization_header(client: TestClient):
+def test_get_current_user_malformed_authorization_header(client: TestClient, make_user):
     """Test with malformed Authorization header (not 'Bearer <token>')."""
     # Create user and token
     token = create_user_and_get_token(
-        client, "malformed@test.com", "password123", "Malformed User", "student"
+        make_user, "malformed@test.com", "password123", "Malformed User", "student"
     )
 
     # Use incorrect header format (missing 'Bearer')
@@ -218,14 +183,14 @@ def test_get_current_user_malformed_authorization_header(client: TestClient):
 # ============================================================================
 
 
-def test_get_user_by_id_success(client: TestClient):
+def test_get_user_by_id_success(client: TestClient, make_user):
     """Test getting another user by ID with authentication (teacher accessing another user)."""
     # Create teacher and student
     token1 = create_user_and_get_token(
-        client, "user1@test.com", "password123", "User One", "teacher"
+        make_user, "user1@test.com", "password123", "User One", "teacher"
     )
 
-    client.post(
+    student_id = client.post(
         "/auth/register",
         json={
             "email": "user2@test.com",
@@ -233,10 +198,12 @@ def test_get_user_by_id_success(client: TestClient):
             "password": "password123",
             "role": "student",
         },
-    )
+    ).json()["id"]
 
     # Teacher gets student's data
-    response = client.get("/users/2", headers={"Authorization": f"Bearer {token1}"})
+    response = client.get(
+        f"/users/{student_id}", headers={"Authorization": f"Bearer {token1}"}
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -244,16 +211,20 @@ def test_get_user_by_id_success(client: TestClient):
     assert data["name"] == "User Two"
     assert data["role"] == "student"
 
+    # Should not include password
+    assert "password" not in data
+    assert "password_hash" not in data
+
 
-def test_get_user_by_id_self(client: TestClient):
+def test_get_user_by_id_self(client: TestClient, make_user):
     """Test getting own user data by ID."""
     # Create user
-    token = create_user_and_get_token(
-        client, "self@test.com", "password123", "Self User", "student"
-    )
+    user, token, _ = make_user("self@test.com", name="Self User")
 
     # Get own user data by ID
-    response = client.get("/users/1", headers={"Authorization": f"Bearer {token}"})
+    response = client.get(
+        f"/users/{user.id}", headers={"Authorization": f"Bearer {token}"}
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -261,18 +232,11 @@ def test_get_user_by_id_self(client: TestClient):
     assert data["name"] == "Self User"
 
 
-def test_get_user_by_id_no_token(client: TestClient):
-    """Test getting user by ID without authentication."""
-    response = client.get("/users/1")
-
-    assert response.status_code == 401
-
-
-def test_get_user_by_id_not_found(client: TestClient):
+def test_get_user_by_id_not_found(client: TestClient, make_user):
     """Test getting non-existent user by ID (teacher can check, gets 404)."""
     # Create teacher and get token
     token = create_user_and_get_token(
-        client, "finder@test.com", "password123", "Finder User", "teacher"
+        make_user, "finder@test.com", "password123", "Finder User", "teacher"
     )
 
     # Try to get non-existent user
@@ -284,6 +248,35 @@ def test_get_user_by_id_not_found(client: TestClient):
     assert "not found" in data["detail"].lower()
 
 
+# ============================================================================
+# AUTHENTICATION REQUIRED TESTS
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "method,url",
+    [
+        ("get", "/users/me"),
+        ("put", "/users/me"),
+        ("get", "/users"),
+        ("get", "/users/1"),
+    ],
+)
+@pytest.mark.parametrize(
+    "headers",
+    [{}, {"Authorization": "Bearer invalid-token"}],
+    ids=["no_token", "invalid_token"],
+)
+def test_users_endpoints_require_authentication(
+    client: TestClient, method: str, url: str, headers: dict
+):
+    """Test that every /users endpoint rejects a missing or invalid token."""
+    response = client.request(method, url, headers=headers, json={"name": "New Name"})
+
+    assert response.status_code == 401
+    assert "detail" in response.json()
+
+
 # ============================================================================
 # TOKEN PAYLOAD VALIDATION TESTS
 # ============================================================================
@@ -291,9 +284,6 @@ def test_get_user_by_id_not_found(client: TestClient):
 
 def test_get_current_user_with_missing_claims(client: TestClient):
     """Test token with missing required claims (user_id)."""
-    from jose import jwt
-    from app.auth import SECRET_KEY, ALGORITHM
-
     # Create user first
     client.post(
         "/auth/register",
@@ -328,11 +318,11 @@ def test_get_current_user_with_missing_claims(client: TestClient):
 # ============================================================================
 
 
-def test_update_current_user_success(client: TestClient):
+def test_update_current_user_success(client: TestClient, make_user):
     """Test updating current user's name successfully."""
     # Create user and get token
     token = create_user_and_get_token(
-        client, "update@test.com", "password123", "Original Name", "student"
+        make_user, "update@test.com", "password123", "Original Name", "student"
     )
 
     # Update user name
@@ -349,39 +339,16 @@ def test_update_current_user_success(client: TestClient):
     assert data["name"] == "Updated Name"
     assert data["email"] == "update@test.com"
     assert data["role"] == "student"
-
-
-def test_update_current_user_returns_updated_data(client: TestClient):
-    """Test that update response contains the new name."""
-    # Create user and get token
-    token = create_user_and_get_token(
-        client, "return@test.com", "password123", "Old Name", "teacher"
-    )
-
-    # Update user name
-    response = client.put(
-        "/users/me",
-        headers={"Authorization": f"Bearer {token}"},
-        json={"name": "New Name"},
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # Response should contain updated name
-    assert data["name"] == "New Name"
     assert "id" in data
-    assert "email" in data
-    assert "role" in data
     assert "created_at" in data
 
 
-def test_update_current_user_persists_changes(client: TestClient, session: Session):
+def test_update_current_user_persists_changes(
+    client: TestClient, make_user, session: Session
+):
     """Test that name update is actually persisted to database."""
     # Create user and get token
-    token = create_user_and_get_token(
-        client, "persist@test.com", "password123", "Before Update", "student"
-    )
+    user, token, _ = make_user("persist@test.com", name="Before Update")
 
     # Update user name
     client.put(
@@ -390,24 +357,22 @@ def test_update_current_user_persists_changes(client: TestClient, session: Sessi
         json={"name": "After Update"},
     )
 
-    # Read from database to verify persistence
-    statement = select(User).where(User.email == "persist@test.com")
-    user = session.exec(statement).first()
+    # Reload the row from the database to verify persistence
+    session.refresh(user)
 
-    assert user is not None
     assert user.name == "After Update"
 
 
-def test_update_does_not_change_other_fields(client: TestClient, session: Session):
+def test_update_does_not_change_other_fields(
+    client: TestClient, make_user, session: Session
+):
     """Test that updating name doesn't change email, role, or other fields."""
     # Create user and get token
-    token = create_user_and_get_token(
-        client, "fields@test.com", "password123", "Original Name", "teacher"
+    user_before, token, _ = make_user(
+        "fields@test.com", name="Original Name", role="teacher"
     )
 
-    # Get user before update
-    statement = select(User).where(User.email == "fields@test.com")
-    user_before = session.exec(statement).first()
+    # Record fields before update
     original_email = user_before.email
     original_role = user_before.role
     original_id = user_before.id
@@ -420,72 +385,31 @@ def test_update_does_not_change_other_fields(client: TestClient, session: Sessio
         json={"name": "New Name"},
     )
 
-    # Get user after update
-    session.expire_all()  # Refresh session
-    user_after = session.exec(statement).first()
+    # Reload the same row after update
+    session.refresh(user_before)
 
     # Name should change
-    assert user_after.name == "New Name"
+    assert user_before.name == "New Name"
 
     # Other fields should NOT change
-    assert user_after.email == original_email
-    assert user_after.role == original_role
-    assert user_after.id == original_id
-    assert user_after.created_at == original_created_at
-
-
-def test_update_current_user_no_token(client: TestClient):
-    """Test updating user without authentication token."""
-    response = client.put("/users/me", json={"name": "New Name"})
-
-    assert response.status_code == 401
-    assert "detail" in response.json()
-
-
-def test_update_current_user_invalid_token(client: TestClient):
-    """Test updating user with invalid token."""
-    response = client.put(
-        "/users/me",
-        headers={"Authorization": "Bearer invalid-token"},
-        json={"name": "New Name"},
-    )
-
-    assert response.status_code == 401
-    assert "detail" in response.json()
+    assert user_before.email == original_email
+    assert user_before.role == original_role
+    assert user_before.id == original_id
+    assert user_before.created_at == original_created_at
 
 
-def test_update_current_user_name_too_short(client: TestClient):
-    """Test that empty name is rejected."""
+@pytest.mark.parametrize("new_name", ["", "a" * 101], ids=["empty", "101_chars"])
+def test_update_current_user_invalid_name(client: TestClient, make_user, new_name: str):
+    """Test that names outside 1-100 characters are rejected."""
     # Create user and get token
     token = create_user_and_get_token(
-        client, "short@test.com", "password123", "Valid Name", "student"
+        make_user, "invalid@test.com", "password123", "Valid Name", "student"
     )
 
-    # Try to update with empty name
-    response = client.put(
-        "/users/me", headers={"Authorization": f"Bearer {token}"}, json={"name": ""}
-    )
-
-    # Should return 422 Unprocessable Entity
-    assert response.status_code == 422
-    data = response.json()
-    assert "detail" in data
-
-
-def test_update_current_user_name_too_long(client: TestClient):
-    """Test that name longer than 100 characters is rejected."""
-    # Create user and get token
-    token = create_user_and_get_token(
-        client, "long@test.com", "password123", "Valid Name", "student"
-    )
-
-    # Try to update with 101 character name
-    long_name = "a" * 101
-
     response = client.put(
         "/users/me",
         headers={"Authorization": f"Bearer {token}"},
-        json={"name": long_name},
+        json={"name": new_name},
     )
 
     # Should return 422 Unprocessable Entity
@@ -494,11 +418,11 @@ def test_update_current_user_name_too_long(client: TestClient):
     assert "detail" in data
 
 
-def test_update_current_user_idempotent(client: TestClient):
+def test_update_current_user_idempotent(client: TestClient, make_user):
     """Test that updating with same name twice works (idempotent)."""
     # Create user and get token
     token = create_user_and_get_token(
-        client, "idempotent@test.com", "password123", "Original", "student"
+        make_user, "idempotent@test.com", "password123", "Original", "student"
     )
 
     # Update name first time
@@ -529,19 +453,17 @@ def test_update_current_user_idempotent(client: TestClient):
 # ============================================================================
 
 
-def test_get_all_users_as_teacher_success(client: TestClient):
+def test_get_all_users_as_teacher_success(
+    client: TestClient, session: Session, teacher_token
+):
     """Test that teacher can successfully list all users."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher User", "teacher"
-    )
-
     # Create some students
-    create_user_and_get_token(
-        client, "student1@test.com", "password123", "Student One", "student"
-    )
-    create_user_and_get_token(
-        client, "student2@test.com", "password123", "Student Two", "student"
+    seed_users(
+        session,
+        [
+            ("student1@test.com", "Student One", "student"),
+            ("student2@test.com", "Student Two", "student"),
+        ],
     )
 
     # Teacher calls GET /users
@@ -560,11 +482,11 @@ def test_get_all_users_as_teacher_success(client: TestClient):
     assert len(data["students"]) == 3
 
 
-def test_get_all_users_as_student_forbidden(client: TestClient):
+def test_get_all_users_as_student_forbidden(client: TestClient, make_user):
     """Test that student gets 403 Forbidden when trying to list users."""
     # Create student
     student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student User", "student"
+        make_user, "student@test.com", "password123", "Student User", "student"
     )
 
     # Student calls GET /users
@@ -578,29 +500,18 @@ def test_get_all_users_as_student_forbidden(client: TestClient):
     assert "permission" in data["detail"].lower()
 
 
-def test_get_all_users_no_token(client: TestClient):
-    """Test that GET /users without authentication returns 401."""
-    response = client.get("/users")
-
-    assert response.status_code == 401
-
-
-def test_get_all_users_returns_multiple_users(client: TestClient):
+def test_get_all_users_returns_multiple_users(
+    client: TestClient, session: Session, teacher_token
+):
     """Test that GET /users returns array with all user data."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher User", "teacher"
-    )
-
     # Create multiple students
-    create_user_and_get_token(
-        client, "student1@test.com", "password123", "Student One", "student"
-    )
-    create_user_and_get_token(
-        client, "student2@test.com", "password123", "Student Two", "student"
-    )
-    create_user_and_get_token(
-        client, "student3@test.com", "password123", "Student Three", "student"
+    seed_users(
+        session,
+        [
+            ("student1@test.com", "Student One", "student"),
+            ("student2@test.com", "Student Two", "student"),
+            ("student3@test.com", "Student Three", "student"),
+        ],
     )
 
     # Teacher calls GET /users
@@ -609,34 +520,19 @@ def test_get_all_users_returns_multiple_users(client: TestClient):
     )
 
     assert response.status_code == 200
-    data = response.json()
 
-    # Should return StudentListResponse with 4 users
-    assert isinstance(data, dict)
-    assert "students" in data
-    assert "total_count" in data
-    assert data["total_count"] == 4
-    assert len(data["students"]) == 4
-
-    # Each user should have required fields
-    for user in data["students"]:
-        assert "id" in user
-        assert "email" in user
-        assert "name" in user
-        assert "role" in user
-        assert "created_at" in user
+    # Should return StudentListResponse with 4 users, each with every
+    # required field
+    data = StudentListResponse.model_validate(response.json())
+    assert data.total_count == 4
+    assert len(data.students) == 4
 
 
-def test_get_all_users_excludes_passwords(client: TestClient):
+def test_get_all_users_excludes_passwords(client: TestClient, make_user, teacher_token):
     """Test that GET /users does not include password fields."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher User", "teacher"
-    )
-
     # Create student
     create_user_and_get_token(
-        client, "student@test.com", "password123", "Student User", "student"
+        make_user, "student@test.com", "password123", "Student User", "student"
     )
 
     # Teacher calls GET /users
@@ -658,16 +554,14 @@ def test_get_all_users_excludes_passwords(client: TestClient):
 # ============================================================================
 
 
-def test_student_can_view_own_profile(client: TestClient):
+def test_student_can_view_own_profile(client: TestClient, make_user):
     """Test that student can view their own profile by ID."""
-    # Create student (will be user_id=1)
-    student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student User", "student"
-    )
+    # Create student
+    student, student_token, _ = make_user("student@test.com", name="Student User")
 
     # Student views their own profile
     response = client.get(
-        "/users/1", headers={"Authorization": f"Bearer {student_token}"}
+        f"/users/{student.id}", headers={"Authorization": f"Bearer {student_token}"}
     )
 
     assert response.status_code == 200
@@ -677,19 +571,17 @@ def test_student_can_view_own_profile(client: TestClient):
     assert data["role"] == "student"
 
 
-def test_student_cannot_view_other_user(client: TestClient):
+def test_student_cannot_view_other_user(client: TestClient, make_user):
     """Test that student gets 403 when trying to view another user."""
     # Create two students
     student1_token = create_user_and_get_token(
-        client, "student1@test.com", "password123", "Student One", "student"
-    )
-    create_user_and_get_token(
-        client, "student2@test.com", "password123", "Student Two", "student"
+        make_user, "student1@test.com", "password123", "Student One", "student"
     )
+    student2, _, _ = make_user("student2@test.com", name="Student Two")
 
     # Student1 tries to view Student2's profile
     response = client.get(
-        "/users/2", headers={"Authorization": f"Bearer {student1_token}"}
+        f"/users/{student2.id}", headers={"Authorization": f"Bearer {student1_token}"}
     )
 
     assert response.status_code == 403
@@ -698,15 +590,10 @@ def test_student_cannot_view_other_user(client: TestClient):
     assert "permission" in data["detail"].lower()
 
 
-def test_teacher_can_view_any_student(client: TestClient):
+def test_teacher_can_view_any_student(client: TestClient, teacher_token):
     """Test that teacher can view any student's profile."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher User", "teacher"
-    )
-
     # Create student
-    client.post(
+    student_id = client.post(
         "/auth/register",
         json={
             "email": "student@test.com",
@@ -714,11 +601,11 @@ def test_teacher_can_view_any_student(client: TestClient):
             "password": "password123",
             "role": "student",
         },
-    )
+    ).json()["id"]
 
-    # Teacher views student's profile (user_id=2)
+    # Teacher views student's profile
     response = client.get(
-        "/users/2", headers={"Authorization": f"Bearer {teacher_token}"}
+        f"/users/{student_id}", headers={"Authorization": f"Bearer {teacher_token}"}
     )
 
     assert response.status_code == 200
@@ -728,13 +615,13 @@ def test_teacher_can_view_any_student(client: TestClient):
     assert data["role"] == "student"
 
 
-def test_teacher_can_view_another_teacher(client: TestClient):
+def test_teacher_can_view_another_teacher(client: TestClient, make_user):
     """Test that teacher can view another teacher's profile."""
     # Create two teachers
     teacher1_token = create_user_and_get_token(
-        client, "teacher1@test.com", "password123", "Teacher One", "teacher"
+        make_user, "teacher1@test.com", "password123", "Teacher One", "teacher"
     )
-    client.post(
+    teacher2_id = client.post(
         "/auth/register",
         json={
             "email": "teacher2@test.com",
@@ -742,11 +629,11 @@ def test_teacher_can_view_another_teacher(client: TestClient):
             "password": "password123",
             "role": "teacher",
         },
-    )
+    ).json()["id"]
 
     # Teacher1 views Teacher2's profile
     response = client.get(
-        "/users/2", headers={"Authorization": f"Bearer {teacher1_token}"}
+        f"/users/{teacher2_id}", headers={"Authorization": f"Bearer {teacher1_token}"}
     )
 
     assert response.status_code == 200
@@ -755,10 +642,10 @@ def test_teacher_can_view_another_teacher(client: TestClient):
     assert data["role"] == "teacher"
 
 
-def test_student_cannot_view_teacher(client: TestClient):
+def test_student_cannot_view_teacher(client: TestClient, make_user):
     """Test that student cannot view teacher's profile."""
     # Create teacher
-    client.post(
+    teacher_id = client.post(
         "/auth/register",
         json={
             "email": "teacher@test.com",
@@ -766,16 +653,16 @@ def test_student_cannot_view_teacher(client: TestClient):
             "password": "password123",
             "role": "teacher",
         },
-    )
+    ).json()["id"]
 
     # Create student
     student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student User", "student"
+        make_user, "student@test.com", "password123", "Student User", "student"
     )
 
-    # Student tries to view teacher's profile (user_id=1)
+    # Student tries to view teacher's profile
     response = client.get(
-        "/users/1", headers={"Authorization": f"Bearer {student_token}"}
+        f"/users/{teacher_id}", headers={"Authorization": f"Bearer {student_token}"}
     )
 
     assert response.status_code == 403
@@ -789,18 +676,15 @@ def test_student_cannot_view_teacher(client: TestClient):
 # ============================================================================
 
 
-def test_list_users_with_pagination_default(client: TestClient):
+def test_list_users_with_pagination_default(
+    client: TestClient, session: Session, teacher_token
+):
     """Test GET /users with default pagination parameters."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create 3 students
-    for i in range(1, 4):
-        create_user_and_get_token(
-            client, f"student{i}@test.com", "password123", f"Student {i}", "student"
-        )
+    seed_users(
+        session,
+        [(f"student{i}@test.com", f"Student {i}", "student") for i in range(1, 4)],
+    )
 
     # Call with no parameters (default: offset=0, limit=10)
     response = client.get(
@@ -823,21 +707,19 @@ def test_list_users_with_pagination_default(client: TestClient):
     assert data["limit"] == 10
 
 
-def test_list_users_with_role_filter_student(client: TestClient):
+def test_list_users_with_role_filter_student(
+    client: TestClient, session: Session, teacher_token
+):
     """Test GET /users with role=student filter."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create 3 students and 1 more teacher
-    for i in range(1, 4):
-        create_user_and_get_token(
-            client, f"student{i}@test.com", "password123", f"Student {i}", "student"
-        )
-
-    create_user_and_get_token(
-        client, "teacher2@test.com", "password123", "Teacher 2", "teacher"
+    seed_users(
+        session,
+        [
+            ("student1@test.com", "Student 1", "student"),
+            ("student2@test.com", "Student 2", "student"),
+            ("student3@test.com", "Student 3", "student"),
+            ("teacher2@test.com", "Teacher 2", "teacher"),
+        ],
     )
 
     # Filter by role=student
@@ -855,22 +737,24 @@ def test_list_users_with_role_filter_student(client: TestClient):
         assert student["role"] == "student"
 
 
-def test_list_users_with_role_filter_teacher(client: TestClient):
+def test_list_users_with_role_filter_teacher(
+    client: TestClient, session: Session, make_user
+):
     """Test GET /users with role=teacher filter."""
     # Create 2 teachers
     teacher_token = create_user_and_get_token(
-        client, "teacher1@test.com", "password123", "Teacher 1", "teacher"
+        make_user, "teacher1@test.com", "password123", "Teacher 1", "teacher"
     )
-    create_user_and_get_token(
-        client, "teacher2@test.com", "password123", "Teacher 2", "teacher"
+    seed_users(
+        session,
+        [
+            ("teacher2@test.com", "Teacher 2", "teacher"),
+            # Create 2 students
+            ("student1@test.com", "Student 1", "student"),
+            ("student2@test.com", "Student 2", "student"),
+        ],
     )
 
-    # Create 2 students
-    for i in range(1, 3):
-        create_user_and_get_token(
-            client, f"student{i}@test.com", "password123", f"Student {i}", "student"
-        )
-
     # Filter by role=teacher
     response = client.get(
         "/users?role=teacher", headers={"Authorization": f"Bearer {teacher_token}"}
@@ -886,18 +770,31 @@ def test_list_users_with_role_filter_teacher(client: TestClient):
         assert teacher["role"] == "teacher"
 
 
-def test_list_users_sort_by_name(client: TestClient):
+def test_list_users_invalid_role_filter(client: TestClient, teacher_token):
+    """Test GET /users with a role that does not exist."""
+    response = client.get(
+        "/users?role=admin", headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+
+    # Should return 422 Unprocessable Entity
+    assert response.status_code == 422
+
+
+def test_list_users_sort_by_name(client: TestClient, session: Session, make_user):
     """Test GET /users with sort=name parameter."""
     # Create teacher
     teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Alice", "teacher"
+        make_user, "teacher@test.com", "password123", "Alice", "teacher"
     )
 
     # Create students with specific names
-    create_user_and_get_token(
-        client, "charlie@test.com", "password123", "Charlie", "student"
+    seed_users(
+        session,
+        [
+            ("charlie@test.com", "Charlie", "student"),
+            ("bob@test.com", "Bob", "student"),
+        ],
     )
-    create_user_and_get_token(client, "bob@test.com", "password123", "Bob", "student")
 
     # Sort by name
     response = client.get(
@@ -913,19 +810,14 @@ def test_list_users_sort_by_name(client: TestClient):
     assert names == sorted(names)
 
 
-def test_list_users_sort_by_points(client: TestClient):
+def test_list_users_sort_by_points(client: TestClient, make_user, teacher_token):
     """Test GET /users with sort=points parameter."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create students
     student1_token = create_user_and_get_token(
-        client, "student1@test.com", "password123", "Student One", "student"
+        make_user, "student1@test.com", "password123", "Student One", "student"
     )
     student2_token = create_user_and_get_token(
-        client, "student2@test.com", "password123", "Student Two", "student"
+        make_user, "student2@test.com", "password123", "Student Two", "student"
     )
 
     # Student 1 completes 1 challenge (100 points)
@@ -977,19 +869,15 @@ def test_list_users_sort_by_points(client: TestClient):
     assert points[0] >= points[1]
 
 
-def test_list_users_sort_by_date(client: TestClient):
+def test_list_users_sort_by_date(client: TestClient, session: Session, teacher_token):
     """Test GET /users with sort=date parameter."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create students
-    create_user_and_get_token(
-        client, "student1@test.com", "password123", "Student One", "student"
-    )
-    create_user_and_get_token(
-        client, "student2@test.com", "password123", "Student Two", "student"
+    seed_users(
+        session,
+        [
+            ("student1@test.com", "Student One", "student"),
+            ("student2@test.com", "Student Two", "student"),
+        ],
     )
 
     # Sort by date (created_at ascending)
@@ -1006,13 +894,8 @@ def test_list_users_sort_by_date(client: TestClient):
     assert dates == sorted(dates)
 
 
-def test_list_users_invalid_sort_parameter(client: TestClient):
+def test_list_users_invalid_sort_parameter(client: TestClient, teacher_token):
     """Test GET /users with invalid sort parameter returns error."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Try with invalid sort parameter
     response = client.get(
         "/users?sort=invalid", headers={"Authorization": f"Bearer {teacher_token}"}
@@ -1022,18 +905,15 @@ def test_list_users_invalid_sort_parameter(client: TestClient):
     assert response.status_code == 422
 
 
-def test_list_users_pagination_offset(client: TestClient):
+def test_list_users_pagination_offset(
+    client: TestClient, session: Session, teacher_token
+):
     """Test GET /users with offset parameter."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create 5 students
-    for i in range(1, 6):
-        create_user_and_get_token(
-            client, f"student{i}@test.com", "password123", f"Student {i}", "student"
-        )
+    seed_users(
+        session,
+        [(f"student{i}@test.com", f"Student {i}", "student") for i in range(1, 6)],
+    )
 
     # Get second page (offset=2, limit=2)
     response = client.get(
@@ -1051,13 +931,8 @@ def test_list_users_pagination_offset(client: TestClient):
     assert len(data["students"]) == 2
 
 
-def test_list_users_pagination_limit_enforced(client: TestClient):
+def test_list_users_pagination_limit_enforced(client: TestClient, teacher_token):
     """Test that limit parameter is enforced (max 1000)."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Try to use limit > 1000
     response = client.get(
         "/users?limit=2000",
@@ -1068,18 +943,15 @@ def test_list_users_pagination_limit_enforced(client: TestClient):
     assert response.status_code == 422
 
 
-def test_list_users_pagination_total_count_accurate(client: TestClient):
+def test_list_users_pagination_total_count_accurate(
+    client: TestClient, session: Session, teacher_token
+):
     """Test that total_count is accurate regardless of pagination."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create 5 students
-    for i in range(1, 6):
-        create_user_and_get_token(
-            client, f"student{i}@test.com", "password123", f"Student {i}", "student"
-        )
+    seed_users(
+        session,
+        [(f"student{i}@test.com", f"Student {i}", "student") for i in range(1, 6)],
+    )
 
     # Get first page (limit=2)
     response1 = client.get(
@@ -1098,16 +970,81 @@ def test_list_users_pagination_total_count_accurate(client: TestClient):
     assert response2.json()["total_count"] == 6
 
 
-def test_student_stats_total_points(client: TestClient):
-    """Test that student stats include total_points earned."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
+def test_list_users_cursor_pagination(
+    client: TestClient, session: Session, teacher_token
+):
+    """Test walking GET /users?sort=date page by page with next_cursor."""
+    # Create 4 students (5 users with the teacher)
+    seed_users(
+        session,
+        [(f"student{i}@test.com", f"Student {i}", "student") for i in range(1, 5)],
+    )
+    headers = {"Authorization": f"Bearer {teacher_token}"}
+
+    emails = []
+    url = "/users?sort=date&limit=2"
+    while True:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        emails.extend(student["email"] for student in data["students"])
+        if data["next_cursor"] is None:
+            break
+        url = f"/users?sort=date&limit=2&cursor={data['next_cursor']}"
+
+    # Every user exactly once, in creation order
+    assert emails == ["teacher@test.com"] + [
+        f"student{i}@test.com" for i in range(1, 5)
+    ]
+
+
+def test_list_users_cursor_rejects_offset(client: TestClient, teacher_token):
+    """Test that a cursor cannot be combined with a non-zero offset."""
+    response = client.get(
+        "/users?sort=date&limit=1", headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+    cursor = response.json()["next_cursor"]
+
+    response = client.get(
+        f"/users?sort=date&cursor={cursor}&offset=50",
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "cursor cannot be combined with offset"
+
+
+def test_list_users_cursor_requires_date_sort(client: TestClient, teacher_token):
+    """Test that a cursor is rejected for sorts other than date."""
+    response = client.get(
+        "/users?sort=date&limit=1", headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+    cursor = response.json()["next_cursor"]
+
+    response = client.get(
+        f"/users?sort=name&cursor={cursor}",
+        headers={"Authorization": f"Bearer {teacher_token}"},
     )
 
+    assert response.status_code == 400
+
+
+def test_list_users_invalid_cursor(client: TestClient, teacher_token):
+    """Test that a malformed cursor returns 400."""
+    response = client.get(
+        "/users?sort=date&cursor=not-a-cursor",
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_student_stats_total_points(client: TestClient, make_user, teacher_token):
+    """Test that student stats include total_points earned."""
     # Create student
     student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Student completes 2 challenges
@@ -1148,16 +1085,13 @@ def test_student_stats_total_points(client: TestClient):
     )  # 100 + 150 points from challenges (1,1) and (1,2)
 
 
-def test_student_stats_challenges_completed(client: TestClient):
+def test_student_stats_challenges_completed(
+    client: TestClient, make_user, teacher_token
+):
     """Test that student stats include challenges_completed count."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create student
     student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Student completes 3 challenges
@@ -1191,16 +1125,13 @@ def test_student_stats_challenges_completed(client: TestClient):
     assert student["challenges_completed"] == 3
 
 
-def test_student_stats_zero_when_no_progress(client: TestClient):
+def test_student_stats_zero_when_no_progress(
+    client: TestClient, make_user, teacher_token
+):
     """Test that student with no progress shows 0 stats."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create student (no progress)
     create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Get students list
@@ -1217,16 +1148,13 @@ def test_student_stats_zero_when_no_progress(client: TestClient):
     assert student["challenges_completed"] == 0
 
 
-def test_student_stats_multi_challenge_aggregation(client: TestClient):
+def test_student_stats_multi_challenge_aggregation(
+    client: TestClient, make_user, teacher_token
+):
     """Test that stats correctly aggregate multiple challenges."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create student
     student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Student completes 2 unit 1 challenges and 1 unit 2 challenge
@@ -1275,16 +1203,11 @@ def test_student_stats_multi_challenge_aggregation(client: TestClient):
     assert student["challenges_completed"] == 3
 
 
-def test_list_users_response_structure(client: TestClient):
+def test_list_users_response_structure(client: TestClient, make_user, teacher_token):
     """Test that response has correct structure with required fields."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create student
     create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Get students list
@@ -1317,16 +1240,11 @@ def test_list_users_response_structure(client: TestClient):
         assert "password_hash" not in student
 
 
-def test_list_users_response_field_types(client: TestClient):
+def test_list_users_response_field_types(client: TestClient, make_user, teacher_token):
     """Test that response fields have correct types."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Create student
     create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Get students list
@@ -1354,13 +1272,8 @@ def test_list_users_response_field_types(client: TestClient):
     assert isinstance(student["challenges_completed"], int)
 
 
-def test_list_users_teacher_can_access(client: TestClient):
+def test_list_users_teacher_can_access(client: TestClient, teacher_token):
     """Test that teacher can access the list students endpoint."""
-    # Create teacher
-    teacher_token = create_user_and_get_token(
-        client, "teacher@test.com", "password123", "Teacher", "teacher"
-    )
-
     # Teacher calls GET /users
     response = client.get(
         "/users", headers={"Authorization": f"Bearer {teacher_token}"}
@@ -1370,11 +1283,11 @@ def test_list_users_teacher_can_access(client: TestClient):
     assert "students" in response.json()
 
 
-def test_list_users_student_forbidden(client: TestClient):
+def test_list_users_student_forbidden(client: TestClient, make_user):
     """Test that student gets 403 when accessing the list students endpoint."""
     # Create student
     student_token = create_user_and_get_token(
-        client, "student@test.com", "password123", "Student", "student"
+        make_user, "student@test.com", "password123", "Student", "student"
     )
 
     # Student calls GET /users
@@ -2,83 +2,30 @@
 Test challenge validation - query validation and attempt tracking.
 """
 
-from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel, select
-from sqlalchemy.pool import StaticPool
 import pytest
-from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
 
 # Import models at module level so SQLModel knows about them
 from app.models import User, Progress, Attempt  # noqa: F401
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """
-    Create a test database engine that persists for the test.
-    Uses StaticPool to ensure all connections share the same in-memory database.
-    """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    yield engine
-
-    # Cleanup
-    engine.dispose()
-
-
-@pytest.fixture(name="session")
-def session_fixture(engine):
-    """
-    Create a database session for direct database access in tests.
-    """
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
-    """
-    Create a test client with a fresh test database for each test.
-    """
-    # Patch create_db_and_tables FIRST before importing app
-    with patch("app.database.create_db_and_tables"):
-        from app.main import app
-        from app.database import get_session
-
-        # Override dependency to use test database
-        def get_test_session():
-            with Session(engine) as session:
-                yield session
-
-        app.dependency_overrides[get_session] = get_test_session
-
-        # Create test client
-        client = TestClient(app, raise_server_exceptions=True)
-        yield client
-
-        app.dependency_overrides.clear()
-
-
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 
 def create_student_and_get_token(
-    client: TestClient, email: str, password: str, name: str
+    make_user, email: str, password: str, name: str
 ) -> str:
     """
     Helper to create a student and get their JWT token.
 
+    The student is inserted directly instead of going through
+    /auth/register and /auth/login.
+
     Args:
-        client: TestClient instance
+        make_user: make_user fixture
         email: Student email
         password: Student password
         name: Student name
@@ -86,12 +33,8 @@ def create_student_and_get_token(
     Returns:
         JWT access token string
     """
-    client.post(
-        "/auth/register",
-        json={"email": email, "name": name, "password": password, "role": "student"},
-    )
-    response = client.post("/auth/login", json={"email": email, "password": password})
-    return response.json()["access_token"]
+    _, token, _ = make_user(email, name=name, role="student", password=password)
+    return token
 
 
 # ============================================================================
@@ -99,10 +42,10 @@ def create_student_and_get_token(
 # ============================================================================
 
 
-def test_correct_query_passes_validation(client: TestClient):
+def test_correct_query_passes_validation(client: TestClient, make_user):
     """Test that correct query (matches sample_solution) passes validation."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit correct query for challenge (1, 1)
@@ -123,10 +66,10 @@ def test_correct_query_passes_validation(client: TestClient):
     assert data["points_earned"] == 100
 
 
-def test_incorrect_query_fails_validation(client: TestClient):
+def test_incorrect_query_fails_validation(client: TestClient, make_user):
     """Test that incorrect query (doesn't match sample_solution) fails validation."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit incorrect query for challenge (1, 1)
@@ -145,10 +88,10 @@ def test_incorrect_query_fails_validation(client: TestClient):
     assert response.status_code == 400
 
 
-def test_query_validation_case_insensitive(client: TestClient):
+def test_query_validation_case_insensitive(client: TestClient, make_user):
     """Test that query validation is case insensitive."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit with different casing - should still pass
@@ -166,10 +109,10 @@ def test_query_validation_case_insensitive(client: TestClient):
     assert response.status_code == 200
 
 
-def test_query_validation_ignores_whitespace(client: TestClient):
+def test_query_validation_ignores_whitespace(client: TestClient, make_user):
     """Test that query validation ignores extra whitespace."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit with extra whitespace - should still pass
@@ -187,10 +130,10 @@ def test_query_validation_ignores_whitespace(client: TestClient):
     assert response.status_code == 200
 
 
-def test_query_validation_with_empty_query(client: TestClient):
+def test_query_validation_with_empty_query(client: TestClient, make_user):
     """Test that empty query fails validation."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit empty query - should fail
@@ -209,96 +152,58 @@ def test_query_validation_with_empty_query(client: TestClient):
 
 
 # ============================================================================
-# ATTEMPT MODEL TESTS (4 tests)
+# ATTEMPT MODEL TESTS (2 tests)
 # ============================================================================
 
 
-def test_attempt_created_on_submission(client: TestClient, session: Session):
-    """Test that Attempt record is created for every submission."""
+@pytest.mark.parametrize(
+    "query,expected_status,expected_is_correct",
+    [
+        ("SELECT * FROM users", 200, True),
+        ("SELECT name FROM users", 400, False),  # Wrong
+    ],
+    ids=["correct", "incorrect"],
+)
+def test_attempt_records_submission_outcome(
+    client: TestClient,
+    make_user,
+    session: Session,
+    query: str,
+    expected_status: int,
+    expected_is_correct: bool,
+):
+    """Test that every submission creates an Attempt marked with its outcome."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
-    # Submit challenge
+    # Submit query
     response = client.post(
         "/progress/submit",
         headers={"Authorization": f"Bearer {token}"},
         json={
             "unit_id": 1,
             "challenge_id": 1,
-            "query": "SELECT * FROM users",
+            "query": query,
             "hints_used": 0,
         },
     )
 
-    assert response.status_code == 200
-
-    # Verify Attempt record created in database
-    statement = select(Attempt).where(Attempt.unit_id == 1, Attempt.challenge_id == 1)
-    attempt = session.exec(statement).first()
-    assert attempt is not None
-
-
-def test_attempt_marked_correct_for_valid_query(client: TestClient, session: Session):
-    """Test that Attempt.is_correct is True for valid query."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
+    assert response.status_code == expected_status
 
-    # Submit correct query
-    response = client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT * FROM users",
-            "hints_used": 0,
-        },
+    # Verify Attempt record created with the right is_correct
+    statement = select(Attempt.is_correct).where(
+        Attempt.unit_id == 1, Attempt.challenge_id == 1
     )
-
-    assert response.status_code == 200
-
-    # Verify is_correct=True in database
-    statement = select(Attempt).where(Attempt.unit_id == 1, Attempt.challenge_id == 1)
-    attempt = session.exec(statement).first()
-    assert attempt is not None
-    assert attempt.is_correct is True
+    assert session.exec(statement).all() == [expected_is_correct]
 
 
-def test_attempt_marked_incorrect_for_invalid_query(
-    client: TestClient, session: Session
+def test_multiple_attempts_tracked_separately(
+    client: TestClient, make_user, session: Session
 ):
-    """Test that Attempt.is_correct is False for invalid query."""
-    token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
-    )
-
-    # Submit incorrect query
-    response = client.post(
-        "/progress/submit",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "unit_id": 1,
-            "challenge_id": 1,
-            "query": "SELECT name FROM users",  # Wrong
-            "hints_used": 0,
-        },
-    )
-
-    assert response.status_code == 400
-
-    # Verify is_correct=False in database
-    statement = select(Attempt).where(Attempt.unit_id == 1, Attempt.challenge_id == 1)
-    attempt = session.exec(statement).first()
-    assert attempt is not None
-    assert attempt.is_correct is False
-
-
-def test_multiple_attempts_tracked_separately(client: TestClient, session: Session):
     """Test that multiple attempts are tracked as separate records."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # First attempt (wrong)
@@ -338,9 +243,10 @@ def test_multiple_attempts_tracked_separately(client: TestClient, session: Sessi
     )
 
     # Verify all 3 attempts in database
-    statement = select(Attempt).where(Attempt.unit_id == 1, Attempt.challenge_id == 2)
-    attempts = session.exec(statement).all()
-    assert len(attempts) == 3
+    statement = select(func.count(Attempt.id)).where(
+        Attempt.unit_id == 1, Attempt.challenge_id == 2
+    )
+    assert session.exec(statement).one() == 3
 
 
 # ============================================================================
@@ -348,10 +254,12 @@ def test_multiple_attempts_tracked_separately(client: TestClient, session: Sessi
 # ============================================================================
 
 
-def test_correct_query_creates_progress(client: TestClient, session: Session):
+def test_correct_query_creates_progress(
+    client: TestClient, make_user, session: Session
+):
     """Test that Progress is created only when query is correct."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit correct query
@@ -369,17 +277,16 @@ def test_correct_query_creates_progress(client: TestClient, session: Session):
     assert response.status_code == 200
 
     # Verify Progress record created
-    statement = select(Progress).where(
+    statement = select(func.count(Progress.id)).where(
         Progress.unit_id == 1, Progress.challenge_id == 1
     )
-    progress = session.exec(statement).first()
-    assert progress is not None
+    assert session.exec(statement).one() == 1
 
 
-def test_incorrect_query_no_progress(client: TestClient, session: Session):
+def test_incorrect_query_no_progress(client: TestClient, make_user, session: Session):
     """Test that Progress is NOT created when query is incorrect."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit incorrect query
@@ -397,17 +304,16 @@ def test_incorrect_query_no_progress(client: TestClient, session: Session):
     assert response.status_code == 400
 
     # Verify NO Progress record created
-    statement = select(Progress).where(
+    statement = select(func.count(Progress.id)).where(
         Progress.unit_id == 1, Progress.challenge_id == 3
     )
-    progress = session.exec(statement).first()
-    assert progress is None
+    assert session.exec(statement).one() == 0
 
 
-def test_correct_query_returns_200_with_points(client: TestClient):
+def test_correct_query_returns_200_with_points(client: TestClient, make_user):
     """Test that correct submission returns 200 with points earned."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit correct query
@@ -432,10 +338,10 @@ def test_correct_query_returns_200_with_points(client: TestClient):
 # ============================================================================
 
 
-def test_first_correct_attempt_awards_points(client: TestClient):
+def test_first_correct_attempt_awards_points(client: TestClient, make_user):
     """Test that first correct attempt awards points immediately."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # Submit correct query
@@ -456,11 +362,11 @@ def test_first_correct_attempt_awards_points(client: TestClient):
 
 
 def test_second_correct_attempt_no_duplicate_progress(
-    client: TestClient, session: Session
+    client: TestClient, make_user, session: Session
 ):
     """Test that second correct attempt doesn't create duplicate Progress."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # First correct submission
@@ -497,17 +403,18 @@ def test_second_correct_attempt_no_duplicate_progress(
     assert second_progress_id == first_progress_id
 
     # Verify only ONE Progress record in database
-    statement = select(Progress).where(
+    statement = select(func.count(Progress.id)).where(
         Progress.unit_id == 2, Progress.challenge_id == 2
     )
-    progress_records = session.exec(statement).all()
-    assert len(progress_records) == 1
+    assert session.exec(statement).one() == 1
 
 
-def test_wrong_then_correct_both_tracked(client: TestClient, session: Session):
+def test_wrong_then_correct_both_tracked(
+    client: TestClient, make_user, session: Session
+):
     """Test that both wrong and correct attempts are tracked in Attempt table."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     # First attempt (wrong)
@@ -539,20 +446,19 @@ def test_wrong_then_correct_both_tracked(client: TestClient, session: Session):
     assert response2.status_code == 200
 
     # Verify both attempts in Attempt table
-    statement = select(Attempt).where(Attempt.unit_id == 3, Attempt.challenge_id == 1)
-    attempts = session.exec(statement).all()
-    assert len(attempts) == 2
-
     # First should be incorrect, second should be correct
-    assert attempts[0].is_correct is False
-    assert attempts[1].is_correct is True
+    statement = (
+        select(Attempt.is_correct)
+        .where(Attempt.unit_id == 3, Attempt.challenge_id == 1)
+        .order_by(Attempt.id)
+    )
+    assert session.exec(statement).all() == [False, True]
 
     # Verify only one Progress record (from correct attempt)
-    statement = select(Progress).where(
+    statement = select(func.count(Progress.id)).where(
         Progress.unit_id == 3, Progress.challenge_id == 1
     )
-    progress = session.exec(statement).first()
-    assert progress is not None
+    assert session.exec(statement).one() == 1
 
 
 # ============================================================================
@@ -560,10 +466,10 @@ def test_wrong_then_correct_both_tracked(client: TestClient, session: Session):
 # ============================================================================
 
 
-def test_incorrect_query_returns_400(client: TestClient):
+def test_incorrect_query_returns_400(client: TestClient, make_user):
     """Test that incorrect query returns HTTP 400."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     response = client.post(
@@ -580,10 +486,10 @@ def test_incorrect_query_returns_400(client: TestClient):
     assert response.status_code == 400
 
 
-def test_error_includes_hint_about_answer(client: TestClient):
+def test_error_includes_hint_about_answer(client: TestClient, make_user):
     """Test that error response includes helpful message about answer."""
     token = create_student_and_get_token(
-        client, "student@test.com", "password123", "Test Student"
+        make_user, "student@test.com", "password123", "Test Student"
     )
 
     response = client.post(